@@ -131,7 +131,7 @@ def cmd_register(args):
         conn.close()
         return
 
-    inserted = 0
+    values = []
     for row in missing:
         source_site = row['source_site']
         category_path = row['category_path']
@@ -149,15 +149,15 @@ def cmd_register(args):
         depth2 = parts[2] if len(parts) > 2 else ''
         depth3 = parts[3] if len(parts) > 3 else ''
 
-        cur.execute("""
-            INSERT INTO mall_categories
-            (mall_name, category_id, gender, depth1, depth2, depth3, full_path, buyma_category_id, is_active)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, NULL, NULL)
-        """, (source_site, category_path, gender, depth1, depth2, depth3, category_path))
-        inserted += 1
+        values.append((source_site, category_path, gender, depth1, depth2, depth3, category_path))
 
-        if inserted % 50 == 0:
-            log(f"  {inserted}/{len(missing)} 등록...")
+    # pymysql executemany 는 INSERT ... VALUES 를 여러 행짜리 문장으로 묶어 보낸다 (행마다 왕복 X)
+    cur.executemany("""
+        INSERT INTO mall_categories
+        (mall_name, category_id, gender, depth1, depth2, depth3, full_path, buyma_category_id, is_active)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, NULL, NULL)
+    """, values)
+    inserted = len(values)
 
     conn.commit()
     conn.close()
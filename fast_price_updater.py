@@ -28,6 +28,8 @@ import os
 import sys
 import io
 import json
+import functools
+import queue
 import time
 import random
 import re
@@ -40,6 +42,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import pymysql
 from dotenv import load_dotenv
@@ -64,6 +67,91 @@ BUYMA_FIXED_VALUES = {
     'shipping_methods': [1063035],
 }
 
+# 고정 공지사항 (가격 수정 요청의 comments)
+FIXED_COMMENTS = """☆☆☆ ご購入前にご確認ください ☆☆☆
+
+◆商品は直営店をはじめ、 デパート、 公式オンラインショップ、ショッピングモールなどの正規品を取り扱う店舗にて買い付けております。100％正規品ですのでご安心ください。
+
+◆「あんしんプラス」へご加入の場合、「サイズがあわない」「イメージと違う」場合に「返品補償制度」をご利用頂けます。
+※「返品対象商品」に限ります。詳しくは右記URLをご参照ください。https://qa.buyma.com/trouble/5206.html
+
+◆ご注文～お届けまで
+手元在庫有：【ご注文確定】 →【梱包】 → 【発送】 → 【お届け】
+手元在庫無し：【ご注文確定】 →【買付】 →【検品】 →【梱包】 →【発送】→【お届け】
+
+◆配送方法/日数
+通常国際便（SAGAWA）：【商品準備2-5日 】+ 【発送～お届け5-9日】
+※平常時の目安です。繁忙期/非常時はお届け日が前後する場合もございます。詳しくはお問合せください。
+※当店では検品時に不良/不具合がある場合は良品に交換をしてお送りしております。当理由でお時間を頂戴する場合は都度ご報告させて頂いております。
+
+◆「お荷物追跡番号あり」にて配送しますので、随時、配送状況をご確認いただけます。
+◆土・日・祝日は発送は休務のため、休み明けに順次発送となります。
+
+◆海外製品は「MADE IN JAPAN」の製品に比べて、若干見劣りする場合もございます。
+返品・交換にあたる不具合の条件に関しては「お取引について」をご確認ください。
+
+◆当店では、日本完売品、日本未入荷アイテム、限定品、
+メンズ、レディース、キッズの シューズ（スニーカー等）や衣類をメインに取り扱っております。
+(カップル,ファミリー、ペアルック、親子リンク)
+韓国の最新トレンドや新作アイテムを順次出品しており、
+
+◆交換・返品・キャンセル
+返品と交換に関する規定は、バイマ規定によりお客様の理由による返品はお受けいたしかねますので、ご購入には慎重にお願いいたします。
+不良品・誤配送は交換、または返品が可能です。
+モニター環境による色違い、サイズ測定方法による1~3cm程度の誤差、糸くず、糸の始末などは欠陥でみなされません。
+製品の大きさは測定方法によって1~3cm程度の誤差が生じることがありますが、欠陥ではございません。
+
+◆不良品について
+検品は行っておりますが、海外製品は日本商品よりも検品基準が低いです。
+下記の理由は返品や交換の原因にはなりません。
+- 縫製の粗さ
+- 縫い終わり部分の糸が切れていないで残っている
+- 生地の色ムラ
+- ミリ段位の傷
+- 若干の汚れ、シミ
+- 製造過程での接着剤の付着など"""
+
+COLORSIZE_FOOTER_SECTIONS = (
+    """
+
+★最安値に挑戦中！★
+本商品は、私たちKONNECT（コネクト）が
+お客様に少しでもお安く提供できるよう、
+最安値での出品に努めた商品です。
+出品時の市場価格調査はもちろん、
+定期的にも価格チェックを行っております。
+（※ただし、価格はリアルタイムで変動するため、
+タイミングによっては最安値ではなくなる場合もございます。
+あらかじめご了承ください。）""",
+    """
+
+★追加料金は一切なし！★
+BUYMAでの決済金額以外、追加費用は一切かかりませんのでご安心ください。
+関税・消費税・送料はすべて商品価格に含まれております。お客様が追加で支払う必要はございません。""",
+    """
+
+★安心の追跡付き発送★
+KONNECT（コネクト）では、すべて追跡可能な配送方法でお届けいたします。
+商品発送後、1～2日ほどでBUYMA上にて追跡番号をご確認いただけます""",
+    """
+
+★ご購入前の在庫確認のお願い★
+在庫状況はリアルタイムではなく、人気の商品は注文時す
+でに《欠品》となっている可能性もございます。
+確実でスピーディーなお取引と、注文確定後のキャンセル
+によるお客様のご負担をなくすため、ご注文手続きの前に
+【在庫確認】のご協力をお願いしております。
+ご検討されている方も、お気軽にお問い合わせ欄からお声
+掛け下さいませ。""",
+    """
+
+※ 上記参考価格は現地参考価格を10KRW ＝ 1.1円で換算したものです
+※仕入れはデパートや公式オンラインショップなど、100％正規品のみ扱っております"""
+)
+
+# 배송 방법 배열 (요청마다 같은 값 — 한 번만 만든다)
+_SHIPPING_METHODS = [{"shipping_method_id": sm_id} for sm_id in BUYMA_FIXED_VALUES['shipping_methods']]
+
 # shop_urls(買付先) 최대 칸수. 초과하면 BUYMA 가 422 로 거부한다:
 #   {"errors":{"shop_urls":["買付先は15件以内で入力してください。"]}}  (2026-07-22 실측)
 MAX_SHOP_URLS = 15
@@ -176,6 +264,26 @@ def filter_details_by_category(details, category_id: int):
     return details
 
 
+@functools.lru_cache(maxsize=4096)
+def _load_details(details_json: str):
+    """
+    details_json 파싱 결과 캐시 (같은 사이즈표 문자열이 상품/옵션마다 반복됨)
+
+    캐시 값은 공유되므로 리스트는 튜플로 보관하고, 호출부에는 사본을 돌려준다.
+    리스트가 아닌 값(dict 등)도 예전처럼 그대로 통과시킨다.
+    """
+    details = json.loads(details_json)
+    return tuple(details) if isinstance(details, list) else details
+
+
+def load_details(details_json: str):
+    """details_json → details (캐시 경유, 호출부가 수정해도 캐시는 안전)"""
+    details = _load_details(details_json)
+    if isinstance(details, tuple):
+        return [dict(d) if isinstance(d, dict) else d for d in details]
+    return dict(details) if isinstance(details, dict) else details
+
+
 # =====================================================
 # 설정값
 # =====================================================
@@ -187,7 +295,7 @@ DB_CONFIG = {
     'password': os.getenv('DB_PASSWORD'),
     'database': os.getenv('DB_NAME'),
     'charset': 'utf8mb4',
-    'cursorclass': pymysql.cursors.DictCursor
+    'cursorclass': pymysql.cursors.DictCursor,
 }
 
 # 바이마 API 설정
@@ -209,7 +317,7 @@ DEFAULT_SHIPPING_FEE = 15000
 # 속도 설정
 REQUEST_DELAY_MIN = 0.1
 REQUEST_DELAY_MAX = 0.3
-API_CALL_DELAY = 0.1
+API_CALL_DELAY = 0.1         # 바이마 API 호출 최소 간격(전체 합산) → _api_rate_limiter
 DEFAULT_WORKERS = 3
 
 # 적응형 주기 스케줄러 설정
@@ -238,6 +346,58 @@ class RateLimiter:
 
 
 _rate_limiter = RateLimiter(RATE_PER_SEC)
+# 바이마 API(가격수정·출품정지) 호출 속도 — 호출마다 뒤에서 자는 대신 호출 직전에 간격만 맞춘다
+_api_rate_limiter = RateLimiter(1.0 / API_CALL_DELAY)
+
+
+class _PooledConnection:
+    """풀에서 빌린 pymysql 연결. close() 하면 끊지 않고 풀에 돌려준다.
+    (okmall/stock_common.py 의 풀과 같은 방식)"""
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool.release(conn)
+
+
+class ConnectionPool:
+    """스레드 안전 pymysql 연결 풀. 워커마다 매 조회/갱신 connect() 하던 것을 재사용으로."""
+    def __init__(self, max_idle, **config):
+        self._config = config
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+            conn.ping(reconnect=True)
+        except queue.Empty:
+            conn = pymysql.connect(**self._config)
+        except pymysql.MySQLError:
+            conn = pymysql.connect(**self._config)
+        return _PooledConnection(self, conn)
+
+    def release(self, conn):
+        try:
+            conn.rollback()  # 커밋 안 된 작업은 다음 사용자에게 넘기지 않는다
+            self._idle.put_nowait(conn)
+        except (queue.Full, pymysql.MySQLError):
+            try:
+                conn.close()
+            except pymysql.MySQLError:
+                pass
+
+
+_db_pool = ConnectionPool(max_idle=DEFAULT_WORKERS * 2, **DB_CONFIG)
+# get_product_data_for_api 전용 — SELECT 여러 개를 한 번에 보낸다 (모두 파라미터 바인딩).
+#   다중 문장 허용은 이 조회 연결에만 둔다 (갱신 등 나머지 연결은 기본 설정 그대로).
+_multi_stmt_pool = ConnectionPool(max_idle=DEFAULT_WORKERS, client_flag=pymysql.constants.CLIENT.MULTI_STATEMENTS,
+                                  **DB_CONFIG)
 
 
 def _next_interval(cur, kept: bool) -> int:
@@ -260,19 +420,31 @@ HEADERS = {
 
 LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
 
+_log_ts_cache = [0, ""]          # [초 단위 epoch, 포맷된 문자열] — 같은 초 안에서는 strftime 재사용
+_log_file_lock = threading.Lock()
+_log_file = [None, None]         # [날짜(YYYYMMDD), 열린 파일] — 줄마다 열고 닫지 않고 날짜가 바뀔 때만 교체
+
 
 def log(msg: str, level: str = "INFO") -> None:
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    t = int(time.time())
+    if t != _log_ts_cache[0]:
+        _log_ts_cache[:] = [t, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))]
+    ts = _log_ts_cache[1]
     line = f"[{ts}] [{level}] {msg}"
     print(line, flush=True)
     # 파일 로그: 1일 1파일(append, 시간 없는 날짜파일). [스킵] 라인은 파일에 안 쌓음.
     if "[스킵]" in msg:
         return
+    day = ts[:10].replace("-", "")
     try:
-        os.makedirs(LOG_DIR, exist_ok=True)
-        fpath = os.path.join(LOG_DIR, f"fast_price_{datetime.now().strftime('%Y%m%d')}.log")
-        with open(fpath, "a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        with _log_file_lock:
+            if _log_file[0] != day:
+                if _log_file[1] is not None:
+                    _log_file[1].close()
+                os.makedirs(LOG_DIR, exist_ok=True)
+                fpath = os.path.join(LOG_DIR, f"fast_price_{day}.log")
+                _log_file[:] = [day, open(fpath, "a", encoding="utf-8", buffering=1)]  # 줄 단위 flush
+            _log_file[1].write(line + "\n")
     except Exception:
         pass
 
@@ -327,11 +499,24 @@ def calculate_margin(price_jpy: int, purchase_price_krw: float,
 class FastPriceUpdater:
 
     def __init__(self):
+        # 연결 풀 크기를 워커 수에 맞춘다 → 동시 조회가 keep-alive 연결을 버리지 않고 재사용
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=DEFAULT_WORKERS * 2)
         self.session = requests.Session()
         self.session.headers.update(HEADERS)
+        self.session.mount('https://', adapter)
+        # 바이마 API 전용 세션 (토큰 헤더 고정, 호출마다 TLS 새로 맺지 않음)
+        self.api_session = requests.Session()
+        self.api_session.headers.update({
+            "Content-Type": "application/json",
+            "X-Buyma-Personal-Shopper-Api-Access-Token": BUYMA_ACCESS_TOKEN
+        })
+        self.api_session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=DEFAULT_WORKERS * 2))
+        # 카테고리별 배송비 {buyma_category_id: fee} — 실행 중엔 바뀌지 않으므로 한 번 읽으면 재사용
+        self._shipping_fee_cache = {}
 
     def get_connection(self) -> pymysql.Connection:
-        return pymysql.connect(**DB_CONFIG)
+        # 풀에서 빌려온다. 호출부의 conn.close() 는 풀 반납이 된다.
+        return _db_pool.connection()
 
     # -------------------------------------------------
     # 1. DB 조회
@@ -445,6 +630,9 @@ class FastPriceUpdater:
     def get_shipping_fee(self, category_id: int) -> int:
         if not category_id:
             return DEFAULT_SHIPPING_FEE
+        fee = self._shipping_fee_cache.get(category_id)
+        if fee is not None:
+            return fee
         conn = self.get_connection()
         try:
             with conn.cursor() as cursor:
@@ -454,14 +642,38 @@ class FastPriceUpdater:
                     WHERE buyma_category_id = %s
                 """, (category_id,))
                 row = cursor.fetchone()
+                fee = DEFAULT_SHIPPING_FEE
                 if row and row.get('expected_shipping_fee'):
-                    return int(row['expected_shipping_fee'])
-                return DEFAULT_SHIPPING_FEE
+                    fee = int(row['expected_shipping_fee'])
+                self._shipping_fee_cache[category_id] = fee
+                return fee
         except:
             return DEFAULT_SHIPPING_FEE
         finally:
             conn.close()
 
+    def prefetch_shipping_fees(self, category_ids) -> None:
+        """아직 캐시에 없는 카테고리 배송비를 IN 쿼리 한 번으로 채운다 (표에 없으면 기본 배송비)."""
+        ids = sorted({cid for cid in category_ids if cid and cid not in self._shipping_fee_cache})
+        if not ids:
+            return
+        fees = dict.fromkeys(ids, DEFAULT_SHIPPING_FEE)
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                fmt = ','.join(['%s'] * len(ids))
+                cursor.execute(f"""
+                    SELECT buyma_category_id, expected_shipping_fee
+                    FROM buyma_master_categories_data
+                    WHERE buyma_category_id IN ({fmt})
+                """, ids)
+                for row in cursor.fetchall():
+                    if row.get('expected_shipping_fee'):
+                        fees[row['buyma_category_id']] = int(row['expected_shipping_fee'])
+        finally:
+            conn.close()
+        self._shipping_fee_cache.update(fees)
+
     # -------------------------------------------------
     # 4. 바이마 API 호출
     # -------------------------------------------------
@@ -471,8 +683,9 @@ class FastPriceUpdater:
             "Content-Type": "application/json",
             "X-Buyma-Personal-Shopper-Api-Access-Token": BUYMA_ACCESS_TOKEN
         }
+        _api_rate_limiter.acquire()
         try:
-            response = requests.post(url, headers=headers, json=request_data, timeout=30)
+            response = self.api_session.post(url, headers=headers, json=request_data, timeout=30)
             if response.status_code in [200, 201, 202]:
                 return {"success": True, "status_code": response.status_code}
             else:
@@ -485,24 +698,48 @@ class FastPriceUpdater:
     # -------------------------------------------------
     # 5. 바이마 API 요청 구성 (가격 수정용 — full data 필요)
     # -------------------------------------------------
-    def get_product_data_for_api(self, ace_product_id: int) -> Dict:
-        """stock_price_synchronizer와 동일 — API 호출에 필요한 전체 데이터 조회"""
-        conn = self.get_connection()
+    def get_product_data_for_api(self, ace_product_id: int, minimal: bool = False) -> Dict:
+        """stock_price_synchronizer와 동일 — API 호출에 필요한 전체 데이터 조회.
+        상품/이미지/옵션/변이/목록/매입처/매입처옵션 SELECT 일곱 개를 한 번에 보내고
+        결과셋을 차례로 읽는다 (매입처 포함 DB 왕복 1회).
+        목록은 @listing_id 로 한 번만 골라 목록·매입처·매입처옵션이 모두 같은 목록에서 나오게 한다.
+        minimal=True: 출품정지(재고 API)용 — reference_number 와 변이만 읽는다 (이미지·옵션·매입처 생략)."""
+        conn = _multi_stmt_pool.connection()
         try:
             with conn.cursor() as cursor:
+                if minimal:
+                    cursor.execute("""
+                        SELECT id, reference_number, locked_reference_number
+                        FROM ace_products WHERE id = %(id)s;
+
+                        SELECT color_value, size_value, stock_type, stocks
+                        FROM ace_product_variants
+                        WHERE ace_product_id = %(id)s
+                    """, {'id': ace_product_id})
+                    product = cursor.fetchone()
+                    cursor.nextset()
+                    variants = cursor.fetchall()
+                    return {'product': product, 'images': [], 'options': [],
+                            'variants': variants, 'shop_urls': []}
+
+                # 정수로 보낼 컬럼은 SQL 에서 SIGNED 로 받아 둔다 (요청 구성 때 int() 변환 불필요)
                 cursor.execute("""
-                    SELECT id, buyma_product_id, reference_number, name, brand_id, brand_name,
-                           category_id, price, original_price_jpy, buying_shop_name,
+                    SELECT id, buyma_product_id, reference_number, name,
+                           CAST(brand_id AS SIGNED) AS brand_id, brand_name,
+                           CAST(category_id AS SIGNED) AS category_id,
+                           CAST(price AS SIGNED) AS price,
+                           CAST(original_price_jpy AS SIGNED) AS original_price_jpy,
+                           buying_shop_name,
                            buyma_model_id, colorsize_comments_jp, available_until,
                            expected_shipping_fee, purchase_price_krw, model_no,
                            source_product_url, source_site,
                            is_buyma_locked,
-                           locked_name, locked_brand_id, locked_category_id, locked_reference_number
-                    FROM ace_products WHERE id = %s
-                """, (ace_product_id,))
-                product = cursor.fetchone()
+                           locked_name,
+                           CAST(locked_brand_id AS SIGNED) AS locked_brand_id,
+                           CAST(locked_category_id AS SIGNED) AS locked_category_id,
+                           locked_reference_number
+                    FROM ace_products WHERE id = %(id)s;
 
-                cursor.execute("""
                     SELECT api.position,
                            CASE WHEN api.position = 1
                                      AND t.thumbnail_cloudflare_url IS NOT NULL
@@ -513,37 +750,56 @@ class FastPriceUpdater:
                     FROM ace_product_images api
                     LEFT JOIN ace_product_thumbnails t
                            ON t.image_id = api.id AND t.is_generated = 1
-                    WHERE api.ace_product_id = %s AND api.cloudflare_image_url IS NOT NULL
-                    ORDER BY api.position LIMIT 20
-                """, (ace_product_id,))
-                images = cursor.fetchall()
+                    WHERE api.ace_product_id = %(id)s AND api.cloudflare_image_url IS NOT NULL
+                    ORDER BY api.position LIMIT 20;
 
-                cursor.execute("""
                     SELECT option_type, value, master_id, position, details_json
                     FROM ace_product_options
-                    WHERE ace_product_id = %s
-                    ORDER BY option_type DESC, position
-                """, (ace_product_id,))
-                options = cursor.fetchall()
+                    WHERE ace_product_id = %(id)s
+                    ORDER BY option_type DESC, position;
 
-                cursor.execute("""
                     SELECT color_value, size_value, stock_type, stocks
                     FROM ace_product_variants
-                    WHERE ace_product_id = %s
-                """, (ace_product_id,))
+                    WHERE ace_product_id = %(id)s;
+
+                    SET @listing_id := (
+                        SELECT so.listing_id FROM source_offerings so
+                        JOIN buyma_listings bl ON bl.id = so.listing_id
+                        WHERE so.ace_product_id = %(id)s AND so.is_active = 1
+                        ORDER BY so.listing_id
+                        LIMIT 1);
+
+                    SELECT id AS listing_id, winner_offering_id
+                    FROM buyma_listings
+                    WHERE id = @listing_id;
+
+                    SELECT id, source_site, source_product_url, purchase_price_krw
+                    FROM source_offerings
+                    WHERE is_active = 1 AND listing_id = @listing_id;
+
+                    SELECT soo.offering_id, soo.color_value, soo.size_value, soo.stock_type
+                    FROM source_offering_options soo
+                    JOIN source_offerings so ON so.id = soo.offering_id
+                    WHERE so.is_active = 1 AND so.listing_id = @listing_id
+                """, {'id': ace_product_id})
+                product = cursor.fetchone()
+                cursor.nextset()
+                images = cursor.fetchall()
+                cursor.nextset()
+                options = cursor.fetchall()
+                cursor.nextset()
                 variants = cursor.fetchall()
+                cursor.nextset()  # SET @listing_id (결과 없음)
+                cursor.nextset()
+                lrow = cursor.fetchone()
+                cursor.nextset()
+                offerings = cursor.fetchall()
+                cursor.nextset()
+                offering_opts = cursor.fetchall()
 
                 # 매입처 전부(병합 상품은 여럿). 이걸 안 보내면 reconcile 이 넣은
-                #   15칸이 여기서 1칸으로 덮어써진다. 같은 커서 재사용(새 연결 안 엶).
-                cursor.execute("""
-                    SELECT so.listing_id, bl.winner_offering_id
-                    FROM source_offerings so
-                    JOIN buyma_listings bl ON bl.id = so.listing_id
-                    WHERE so.ace_product_id = %s AND so.is_active = 1
-                    LIMIT 1
-                """, (ace_product_id,))
-                lrow = cursor.fetchone()
-                shop_urls = (self.build_shop_urls(cursor, lrow['listing_id'], lrow['winner_offering_id'])
+                #   15칸이 여기서 1칸으로 덮어써진다. 목록 조회와 같은 왕복에서 이미 읽어 둠.
+                shop_urls = (self.build_shop_urls(list(offerings), offering_opts, lrow['winner_offering_id'])
                              if lrow else [])
 
                 return {'product': product, 'images': images, 'options': options,
@@ -551,23 +807,11 @@ class FastPriceUpdater:
         finally:
             conn.close()
 
-    def build_shop_urls(self, cursor, listing_id, winner_offering_id) -> list:
+    def build_shop_urls(self, offerings: list, opt_rows: list, winner_offering_id) -> list:
         """이 목록의 소싱처 전부 → BUYMA shop_urls 배열.
+        offerings / opt_rows 는 get_product_data_for_api 가 같은 왕복에서 읽어 온 매입처·매입처옵션 행.
         winner 맨 앞, 나머지는 매입가 싼 순. 상한 15칸.
         ★ reconcile_buyma_push._shop_urls 와 같은 규칙 — 한쪽만 고치면 서로 덮어쓴다."""
-        cursor.execute("""
-            SELECT id, source_site, source_product_url, purchase_price_krw
-            FROM source_offerings
-            WHERE listing_id = %s AND is_active = 1
-        """, (listing_id,))
-        offerings = cursor.fetchall()
-        cursor.execute("""
-            SELECT soo.offering_id, soo.color_value, soo.size_value, soo.stock_type
-            FROM source_offering_options soo
-            JOIN source_offerings so ON so.id = soo.offering_id
-            WHERE so.listing_id = %s AND so.is_active = 1
-        """, (listing_id,))
-        opt_rows = cursor.fetchall()
 
         stock_by_off = {}
         for r in opt_rows:
@@ -599,8 +843,10 @@ class FastPriceUpdater:
             })
         return out[:MAX_SHOP_URLS]
 
-    def build_buyma_request_update(self, data: Dict, new_price_jpy: int) -> Dict:
-        """가격 수정용 바이마 API 요청 (stock_price_synchronizer.build_buyma_request와 동일 구조)"""
+    def build_buyma_request_update(self, data: Dict, new_price_jpy: int,
+                                   order_quantity: Optional[int] = None) -> Dict:
+        """가격 수정용 바이마 API 요청 (stock_price_synchronizer.build_buyma_request와 동일 구조)
+        order_quantity: 배치에서 미리 뽑아 둔 값. 없으면 여기서 90~100 중 하나."""
         product = data['product']
         images = data['images']
         options = data['options']
@@ -611,88 +857,6 @@ class FastPriceUpdater:
         model_no_text = '\n'.join(model_no_list)
         style_numbers = [{"number": num, "memo": ""} for num in model_no_list]
 
-        # 고정 공지사항
-        fixed_comments = """☆☆☆ ご購入前にご確認ください ☆☆☆
-
-◆商品は直営店をはじめ、 デパート、 公式オンラインショップ、ショッピングモールなどの正規品を取り扱う店舗にて買い付けております。100％正規品ですのでご安心ください。
-
-◆「あんしんプラス」へご加入の場合、「サイズがあわない」「イメージと違う」場合に「返品補償制度」をご利用頂けます。
-※「返品対象商品」に限ります。詳しくは右記URLをご参照ください。https://qa.buyma.com/trouble/5206.html
-
-◆ご注文～お届けまで
-手元在庫有：【ご注文確定】 →【梱包】 → 【発送】 → 【お届け】
-手元在庫無し：【ご注文確定】 →【買付】 →【検品】 →【梱包】 →【発送】→【お届け】
-
-◆配送方法/日数
-通常国際便（SAGAWA）：【商品準備2-5日 】+ 【発送～お届け5-9日】
-※平常時の目安です。繁忙期/非常時はお届け日が前後する場合もございます。詳しくはお問合せください。
-※当店では検品時に不良/不具合がある場合は良品に交換をしてお送りしております。当理由でお時間を頂戴する場合は都度ご報告させて頂いております。
-
-◆「お荷物追跡番号あり」にて配送しますので、随時、配送状況をご確認いただけます。
-◆土・日・祝日は発送は休務のため、休み明けに順次発送となります。
-
-◆海外製品は「MADE IN JAPAN」の製品に比べて、若干見劣りする場合もございます。
-返品・交換にあたる不具合の条件に関しては「お取引について」をご確認ください。
-
-◆当店では、日本完売品、日本未入荷アイテム、限定品、
-メンズ、レディース、キッズの シューズ（スニーカー等）や衣類をメインに取り扱っております。
-(カップル,ファミリー、ペアルック、親子リンク)
-韓国の最新トレンドや新作アイテムを順次出品しており、
-
-◆交換・返品・キャンセル
-返品と交換に関する規定は、バイマ規定によりお客様の理由による返品はお受けいたしかねますので、ご購入には慎重にお願いいたします。
-不良品・誤配送は交換、または返品が可能です。
-モニター環境による色違い、サイズ測定方法による1~3cm程度の誤差、糸くず、糸の始末などは欠陥でみなされません。
-製品の大きさは測定方法によって1~3cm程度の誤差が生じることがありますが、欠陥ではございません。
-
-◆不良品について
-検品は行っておりますが、海外製品は日本商品よりも検品基準が低いです。
-下記の理由は返品や交換の原因にはなりません。
-- 縫製の粗さ
-- 縫い終わり部分の糸が切れていないで残っている
-- 生地の色ムラ
-- ミリ段位の傷
-- 若干の汚れ、シミ
-- 製造過程での接着剤の付着など"""
-
-        colorsize_footer_sections = [
-            """
-
-★最安値に挑戦中！★
-本商品は、私たちKONNECT（コネクト）が
-お客様に少しでもお安く提供できるよう、
-最安値での出品に努めた商品です。
-出品時の市場価格調査はもちろん、
-定期的にも価格チェックを行っております。
-（※ただし、価格はリアルタイムで変動するため、
-タイミングによっては最安値ではなくなる場合もございます。
-あらかじめご了承ください。）""",
-            """
-
-★追加料金は一切なし！★
-BUYMAでの決済金額以外、追加費用は一切かかりませんのでご安心ください。
-関税・消費税・送料はすべて商品価格に含まれております。お客様が追加で支払う必要はございません。""",
-            """
-
-★安心の追跡付き発送★
-KONNECT（コネクト）では、すべて追跡可能な配送方法でお届けいたします。
-商品発送後、1～2日ほどでBUYMA上にて追跡番号をご確認いただけます""",
-            """
-
-★ご購入前の在庫確認のお願い★
-在庫状況はリアルタイムではなく、人気の商品は注文時す
-でに《欠品》となっている可能性もございます。
-確実でスピーディーなお取引と、注文確定後のキャンセル
-によるお客様のご負担をなくすため、ご注文手続きの前に
-【在庫確認】のご協力をお願いしております。
-ご検討されている方も、お気軽にお問い合わせ欄からお声
-掛け下さいませ。""",
-            """
-
-※ 上記参考価格は現地参考価格を10KRW ＝ 1.1円で換算したものです
-※仕入れはデパートや公式オンラインショップなど、100％正規品のみ扱っております"""
-        ]
-
         # available_until
         available_until = product.get('available_until')
         if available_until:
@@ -730,11 +894,11 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
             }
             if row['option_type'] == 'size' and row.get('details_json'):
                 try:
-                    details = json.loads(row['details_json'])
+                    details = load_details(row['details_json'])
                     if details:
                         cat_id = product.get('locked_category_id') or product['category_id']
                         if cat_id:
-                            details = filter_details_by_category(details, int(cat_id))
+                            details = filter_details_by_category(details, cat_id)
                         if details:
                             opt['details'] = details
                 except:
@@ -755,9 +919,6 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
                 variant["options"].append({"type": "size", "value": truncate_option_value(v['size_value'])})
             variants_arr.append(variant)
 
-        # shipping
-        shipping_methods = [{"shipping_method_id": sm_id} for sm_id in BUYMA_FIXED_VALUES['shipping_methods']]
-
         # 잠금 필드 처리
         if product.get('is_buyma_locked') == 1:
             api_name = product.get('locked_name') or product['name']
@@ -775,18 +936,18 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
             "id": product['buyma_product_id'],
             "reference_number": api_reference_number,
             "name": truncate_buyma_name(api_name),
-            "comments": f"{api_name}\n{model_no_text}\n\n{fixed_comments}" if model_no_text else f"{api_name}\n\n{fixed_comments}",
-            "brand_id": int(api_brand_id) if api_brand_id else 0,
-            "category_id": int(api_category_id),
+            "comments": f"{api_name}\n{model_no_text}\n\n{FIXED_COMMENTS}" if model_no_text else f"{api_name}\n\n{FIXED_COMMENTS}",
+            "brand_id": api_brand_id or 0,
+            "category_id": api_category_id,
             "price": new_price_jpy,
             "available_until": available_until_str,
             "buying_area_id": BUYMA_FIXED_VALUES['buying_area_id'],
             "shipping_area_id": BUYMA_FIXED_VALUES['shipping_area_id'],
-            "shipping_methods": shipping_methods,
+            "shipping_methods": _SHIPPING_METHODS,
             "images": images_arr,
             "options": options_arr,
             "variants": variants_arr,
-            "order_quantity": random.randint(90, 100),
+            "order_quantity": order_quantity if order_quantity is not None else random.randint(90, 100),
             "theme_id": BUYMA_FIXED_VALUES['theme_id'],
             "duty": BUYMA_FIXED_VALUES['duty'],
         }
@@ -800,7 +961,7 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
         if product.get('buying_shop_name'):
             request_data['buying_shop_name'] = truncate_buyma_name(product['buying_shop_name'], max_limit=30)
         if product.get('original_price_jpy'):
-            ref_price = int(product['original_price_jpy'])
+            ref_price = product['original_price_jpy']
             if ref_price > new_price_jpy:
                 request_data['reference_price'] = ref_price
         if product.get('buyma_model_id'):
@@ -822,14 +983,14 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
         remaining = COLORSIZE_LIMIT - len(base_colorsize)
         end_idx = 0
         cumulative_len = 0
-        for i in range(len(colorsize_footer_sections)):
-            section_len = len(colorsize_footer_sections[i])
+        for i in range(len(COLORSIZE_FOOTER_SECTIONS)):
+            section_len = len(COLORSIZE_FOOTER_SECTIONS[i])
             if cumulative_len + section_len <= remaining:
                 cumulative_len += section_len
                 end_idx = i + 1
             else:
                 break
-        colorsize_footer = ''.join(colorsize_footer_sections[:end_idx])
+        colorsize_footer = ''.join(COLORSIZE_FOOTER_SECTIONS[:end_idx])
         request_data['colorsize_comments'] = base_colorsize + colorsize_footer
 
         return {"product": request_data}
@@ -868,8 +1029,9 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
                 "order_quantity": 0,
             }
         }
+        _api_rate_limiter.acquire()
         try:
-            response = requests.post(url, headers=headers, json=request_data, timeout=30)
+            response = self.api_session.post(url, headers=headers, json=request_data, timeout=30)
             if response.status_code in [200, 201, 202]:
                 return {"success": True, "status_code": response.status_code}
             else:
@@ -1018,8 +1180,13 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
     # 7. 단일 상품 처리
     # -------------------------------------------------
     def process_single_product(self, product: Dict, idx: int, total: int,
-                                dry_run: bool, stats: Dict, stats_lock: threading.Lock) -> None:
+                                dry_run: bool, stats: Dict, stats_lock: threading.Lock,
+                                order_quantity: Optional[int] = None,
+                                price_offset: Optional[int] = None) -> None:
         ace_id = product['id']
+        # 경쟁자보다 낮출 금액(1~9엔). 배치에서 미리 뽑아 둔 값이 없으면 여기서 뽑는다.
+        if price_offset is None:
+            price_offset = random.randint(1, 9)
         model_no = product['model_no']
         brand = product['brand_name'] or ''
         current_price = product.get('price') or 0
@@ -1074,7 +1241,7 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
                 return
 
             # gap이 큼 → 2순위 바로 아래로 가격 조정
-            new_price_jpy = competitor_price - random.randint(1, 9)
+            new_price_jpy = competitor_price - price_offset
             log(f"{prefix} [조정] 최저가지만 gap 큼: ¥{current_price:,}→¥{new_price_jpy:,} (경쟁자 ¥{competitor_price:,}) | 주기 {cur_interval or MAX_INTERVAL_MIN}→{_next_interval(cur_interval, True)}분")
 
             if dry_run:
@@ -1089,7 +1256,7 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
             self._reschedule(ace_id, kept=True, cur_interval_min=cur_interval)  # 내가 최저(gap 조정) → 유지
 
             api_data = self.get_product_data_for_api(ace_id)
-            request_json = self.build_buyma_request_update(api_data, new_price_jpy)
+            request_json = self.build_buyma_request_update(api_data, new_price_jpy, order_quantity)
             result = self.call_buyma_api(request_json)
             self.update_api_log(ace_id, request_json, result)
 
@@ -1102,11 +1269,10 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
                 with stats_lock:
                     stats['api_failed'] += 1
 
-            time.sleep(API_CALL_DELAY)
             return
 
         # 내가 최저가 아님 → 가격 인하 가능 여부 확인
-        new_price_jpy = competitor_price - random.randint(1, 9)
+        new_price_jpy = competitor_price - price_offset
         shipping_fee = product.get('expected_shipping_fee') or self.get_shipping_fee(product.get('category_id'))
         margin_info = calculate_margin(new_price_jpy, purchase_price_krw, shipping_fee)
 
@@ -1128,7 +1294,7 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
 
             # 바이마 API 호출 (가격 수정)
             api_data = self.get_product_data_for_api(ace_id)
-            request_json = self.build_buyma_request_update(api_data, new_price_jpy)
+            request_json = self.build_buyma_request_update(api_data, new_price_jpy, order_quantity)
             result = self.call_buyma_api(request_json)
             self.update_api_log(ace_id, request_json, result)
 
@@ -1141,8 +1307,6 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
                 with stats_lock:
                     stats['api_failed'] += 1
 
-            time.sleep(API_CALL_DELAY)
-
         else:
             # 마진 - → 출품정지중(재고 API). 삭제 아님 → buyma_product_id 유지, 마진 회복 시 같은 상품으로 복구.
             log(f"{prefix} [출품정지중] 마진 마이너스 ₩{margin_info['margin_krw']:,.0f} (경쟁자 ¥{competitor_price:,})", "WARNING")
@@ -1153,7 +1317,8 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
                 return
 
             # 재고 API: 전 옵션 out_of_stock + order_quantity:0 (변이 = 상품의 모든 색/사이즈)
-            api_data = self.get_product_data_for_api(ace_id)
+            #   참조번호·변이만 쓰므로 이미지/옵션/매입처 조회는 생략
+            api_data = self.get_product_data_for_api(ace_id, minimal=True)
             reference_number = (api_data['product'].get('locked_reference_number')
                                 or api_data['product'].get('reference_number'))
             variant_rows = api_data['variants']
@@ -1178,8 +1343,6 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
                 with stats_lock:
                     stats['api_failed'] += 1
 
-            time.sleep(API_CALL_DELAY)
-
     # -------------------------------------------------
     # 8. 메인 실행
     # -------------------------------------------------
@@ -1256,10 +1419,17 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
             'api_called': 0, 'api_failed': 0,
         }
         stats_lock = threading.Lock()
+        # 배송비 미지정 상품의 카테고리 배송비는 미리 한 번에 읽어 둔다
+        self.prefetch_shipping_fees(p.get('category_id') for p in products
+                                    if not p.get('expected_shipping_fee'))
+        # 상품별 order_quantity(90~100)·가격 인하폭(1~9엔)은 배치 시작 때 한 번에 뽑아 나눠 준다
+        order_quantities = random.choices(range(90, 101), k=len(products))
+        price_offsets = random.choices(range(1, 10), k=len(products))
         with ThreadPoolExecutor(max_workers=DEFAULT_WORKERS) as executor:
             futures = [
                 executor.submit(self.process_single_product,
-                                product, idx + 1, len(products), dry_run, stats, stats_lock)
+                                product, idx + 1, len(products), dry_run, stats, stats_lock,
+                                order_quantities[idx], price_offsets[idx])
                 for idx, product in enumerate(products)
             ]
             for future in as_completed(futures):
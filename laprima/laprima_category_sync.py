@@ -29,7 +29,7 @@ from typing import Dict, List, Tuple, Optional
 import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, create_engine, text
 
 load_dotenv(os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env'))
 
@@ -220,22 +220,24 @@ def diff(live: List[Dict], db: List[Dict]) -> Dict:
 # ===========================================
 def apply_changes(d: Dict):
     """추가 INSERT + 삭제 소프트비활성(is_active=0). 유지/이름변경은 손대지 않음."""
+    # 파라미터 리스트를 한 번에 넘겨 executemany 로 보낸다 (행마다 execute 하지 않음)
     with engine.begin() as conn:
-        for c in d['added']:
+        if d['added']:
             conn.execute(text("""
                 INSERT INTO mall_categories
                   (mall_name, category_id, gender, depth1, depth2, depth3,
                    full_path, buyma_category_id, is_active, mall_category_url)
                 VALUES
                   (:mn, :cid, :g, :d1, :d2, :d3, :fp, NULL, 1, :url)
-            """), {'mn': SOURCE_SITE, 'cid': c['cate_no'], 'g': c['gender'],
-                   'd1': c['depth1'], 'd2': c['depth2'], 'd3': c['depth3'],
-                   'fp': c['full_path'], 'url': c['url']})
-        for c in d['removed']:
+            """), [{'mn': SOURCE_SITE, 'cid': c['cate_no'], 'g': c['gender'],
+                    'd1': c['depth1'], 'd2': c['depth2'], 'd3': c['depth3'],
+                    'fp': c['full_path'], 'url': c['url']} for c in d['added']])
+        if d['removed']:
             conn.execute(text("""
                 UPDATE mall_categories SET is_active = 0
-                WHERE mall_name = 'laprima' AND category_id = :cid
-            """), {'cid': c['category_id']})
+                WHERE mall_name = 'laprima' AND category_id IN :cids
+            """).bindparams(bindparam('cids', expanding=True)),
+                {'cids': [c['category_id'] for c in d['removed']]})
 
 
 # ===========================================
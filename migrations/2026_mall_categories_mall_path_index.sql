@@ -0,0 +1,13 @@
+-- mall_categories (mall_name, full_path) 복합 인덱스.
+--
+-- 문제: category_cleaner register 의 미등록 경로 판정(NOT EXISTS ... mc.full_path = rsd.category_path
+--   AND mc.mall_name = rsd.source_site)과 apply 의 카테고리 조인이 mall_categories 를
+--   (mall_name, full_path) 로 찾는데 해당 인덱스가 없어, raw_scraped_data 경로마다 mall_categories 를 스캔.
+-- 조치: (mall_name, full_path(255)) 복합 인덱스 → 경로당 인덱스 탐색 1회.
+--   full_path 는 긴 경로가 있을 수 있어 앞 255자 prefix 인덱스 (탐색용이라 유일성과 무관).
+--
+-- 원칙: 인덱스 1건 추가만 → 기존 데이터·로직 0 영향.
+--   IF NOT EXISTS 로 멱등화 — 재실행해도 중복오류 없음.
+--   운영 중 적용 시엔 SET SESSION lock_wait_timeout 을 짧게(예: 30) 두고 실행 권장.
+
+CREATE INDEX IF NOT EXISTS idx_mc_mall_path ON mall_categories (mall_name, full_path(255));
@@ -28,16 +28,26 @@ reconcile(okmall/reconcile_runner.py → reconcile_buyma_push.py)이 지휘하
 import os
 import sys
 import json
+import functools
 import random
 from datetime import datetime, timedelta
+from decimal import Decimal
+from types import MappingProxyType
 from typing import Dict, List
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 from dotenv import load_dotenv
 
 import unicodedata
 
+try:
+    import orjson  # 있으면 요청 본문 직렬화에 사용 (C 구현, 표준 json 보다 빠름)
+except ImportError:
+    orjson = None
+
 def truncate_buyma_name(text, max_limit=60):
     """
     Buyma 상품명 제한(반각 60자/전각 30자)에 맞춰 문자열을 자르는 함수
@@ -180,6 +190,102 @@ BUYMA_FIXED_VALUES = {
     'shipping_methods': [1063035],        # 배송 방법 ID
 }
 
+# 고정 공지사항 (comments) - 한국어 완벽 제거
+FIXED_COMMENTS = """☆☆☆ ご購入前にご確認ください ☆☆☆
+
+◆商品は直営店をはじめ、 デパート、 公式オンラインショップ、ショッピングモールなどの正規品を取り扱う店舗にて買い付けております。100％正規品ですのでご安心ください。
+
+◆「あんしんプラス」へご加入の場合、「サイズがあわない」「イメージと違う」場合に「返品補償制度」をご利用頂けます。
+※「返品対象商品」に限ります。詳しくは右記URLをご参照ください。https://qa.buyma.com/trouble/5206.html
+
+◆ご注文～お届けまで
+手元在庫有：【ご注文確定】 →【梱包】 → 【発送】 → 【お届け】
+手元在庫無し：【ご注文確定】 →【買付】 →【検品】 →【梱包】 →【発送】→【お届け】
+
+◆配送方法/日数
+通常国際便（SAGAWA）：【商品準備2-5日 】+ 【発送～お届け5-9日】
+※平常時の目安です。繁忙期/非常時はお届け日が前後する場合もございます。詳しくはお問合せください。
+※当店では検品時に不良/不具合がある場合は良品に交換をしてお送りしております。当理由でお時間を頂戴する場合は都度ご報告させて頂いております。
+
+◆「お荷物追跡番号あり」にて配送しますので、随時、配送状況をご確認いただけます。
+◆土・日・祝日は発送は休務のため、休み明けに順次発送となります。
+
+◆海外製品は「MADE IN JAPAN」の製品に比べて、若干見劣りする場合もございます。
+返品・交換にあたる不具合の条件に関しては「お取引について」をご確認ください。
+
+◆当店では、日本完売品、日本未入荷アイテム、限定品、
+メンズ、レディース、キッズの シューズ（スニーカー等）や衣類をメインに取り扱っております。
+(カップル,ファミリー、ペアルック、親子リンク)
+韓国の最新トレンドや新作アイテムを順次出品しており、
+
+◆交換・返品・キャンセル
+返品と交換に関する規定は、バイマ規定によりお客様の理由による返品はお受けいたしかねますので、ご購入には慎重にお願いいたします。
+不良品・誤配送は交換、または返品が可能です。
+モニター環境による色違い、サイズ測定方法による1~3cm程度の誤差、糸くず、糸の始末などは欠陥でみなされません。
+製品の大きさは測定方法によって1~3cm程度の誤差が生じることがありますが、欠陥ではございません。
+
+◆不良品について
+検品は行っておりますが、海外製品は日本商品よりも検品基準が低いです。
+下記の理由は返品や交換の原因にはなりません。
+- 縫製の粗さ
+- 縫い終わり部分の糸が切れていないで残っている
+- 生地の色ムラ
+- ミリ段位の傷
+- 若干の汚れ、シミ
+- 製造過程での接着剤の付着など"""
+
+# 색상/사이즈 보충 정보 푸터 섹션별 분리 (뒤 섹션부터 제거)
+COLORSIZE_FOOTER_SECTIONS = (
+    """
+
+★最安値に挑戦中！★
+本商品は、私たちKONNECT（コネクト）が
+お客様に少しでもお安く提供できるよう、
+最安値での出品に努めた商品です。
+出品時の市場価格調査はもちろん、
+定期的にも価格チェックを行っております。
+（※ただし、価格はリアルタイムで変動するため、
+タイミングによっては最安値ではなくなる場合もございます。
+あらかじめご了承ください。）""",
+    """
+
+★追加料金は一切なし！★
+BUYMAでの決済金額以外、追加費用は一切かかりませんのでご安心ください。
+関税・消費税・送料はすべて商品価格に含まれております。お客様が追加で支払う必要はございません。""",
+    """
+
+★安心の追跡付き発送★
+KONNECT（コネクト）では、すべて追跡可能な配送方法でお届けいたします。
+商品発送後、1〜2日ほどでBUYMA上にて追跡番号をご確認いただけます""",
+    """
+
+★ご購入前の在庫確認のお願い★
+在庫状況はリアルタイムではなく、人気の商品は注文時す
+でに《欠品》となっている可能性もございます。
+確実でスピーディーなお取引と、注文確定後のキャンセル
+によるお客様のご負担をなくすため、ご注文手続きの前に
+【在庫確認】のご協力をお願いしております。
+ご検討されている方も、お気軽にお問い合わせ欄からお声
+掛け下さいませ。""",
+    """
+
+※ 上記参考価格は現地参考価格を10KRW ＝ 1.1円で換算したものです
+※仕入れはデパートや公式オンラインショップなど、100％正規品のみ扱っております"""
+)
+
+# 요청서 중 상품과 무관한 고정 부분 (build_request_json 이 매번 펼쳐 쓴다)
+_BASE_REQUEST = MappingProxyType({
+    "control": "publish",
+    "buying_area_id": BUYMA_FIXED_VALUES['buying_area_id'],
+    "shipping_area_id": BUYMA_FIXED_VALUES['shipping_area_id'],
+    # 배송 방법 배열 (객체 배열 형식)
+    "shipping_methods": [
+        {"shipping_method_id": sm_id} for sm_id in BUYMA_FIXED_VALUES['shipping_methods']
+    ],
+    "theme_id": BUYMA_FIXED_VALUES['theme_id'],
+    "duty": BUYMA_FIXED_VALUES['duty'],
+})
+
 # shop_urls(買付先) 최대 칸수. 초과하면 BUYMA 가 422 로 거부한다:
 #   {"errors":{"shop_urls":["買付先は15件以内で入力してください。"]}}  (2026-07-22 실측)
 MAX_SHOP_URLS = 15
@@ -271,6 +377,8 @@ def load_category_size_keys() -> Dict[int, List[str]]:
 
     import csv
     csv_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'buyma_master_data', 'size_details.csv')
+    # 지역 dict 에 다 채운 뒤 한 번에 바꿔 끼운다 (reconcile push 스레드가 반쯤 찬 캐시를 보지 않도록)
+    keys_map: Dict[int, List[str]] = {}
     try:
         with open(csv_path, 'r', encoding='utf-8-sig') as f:
             reader = csv.DictReader(f)
@@ -279,10 +387,11 @@ def load_category_size_keys() -> Dict[int, List[str]]:
                 key_name = row.get('name', '').strip()
                 if cat_id and cat_id.isdigit() and key_name:
                     cat_id = int(cat_id)
-                    if cat_id not in _category_size_keys_cache:
-                        _category_size_keys_cache[cat_id] = []
-                    if key_name not in _category_size_keys_cache[cat_id]:
-                        _category_size_keys_cache[cat_id].append(key_name)
+                    if cat_id not in keys_map:
+                        keys_map[cat_id] = []
+                    if key_name not in keys_map[cat_id]:
+                        keys_map[cat_id].append(key_name)
+        _category_size_keys_cache = keys_map
         log(f"카테고리별 size_details 키 매핑 {len(_category_size_keys_cache)}개 카테고리 로드")
     except Exception as e:
         log(f"size_details.csv 로드 실패: {e}", "WARNING")
@@ -303,6 +412,24 @@ def filter_details_by_category(details: List[Dict], category_id: int) -> List[Di
     return filtered
 
 
+@functools.lru_cache(maxsize=4096)
+def _load_details(details_json: str) -> tuple:
+    """
+    details_json 파싱 결과 캐시 (같은 사이즈표 문자열이 상품/옵션마다 반복됨)
+
+    캐시 값은 공유되므로 튜플로 보관하고, 호출부에는 dict 사본 리스트를 돌려준다.
+    """
+    details = json.loads(details_json)
+    if not isinstance(details, list):
+        return ()
+    return tuple(details)
+
+
+def load_details(details_json: str) -> List[Dict]:
+    """details_json → details 리스트 (캐시 경유, 호출부가 수정해도 캐시는 안전)"""
+    return [dict(d) if isinstance(d, dict) else d for d in _load_details(details_json)]
+
+
 def build_options_array(option_rows: List[Dict], valid_sizes: set = None, valid_colors: set = None, category_id: int = 0) -> List[Dict]:
     """
     options 배열 구성 (size인 경우 details 포함)
@@ -334,7 +461,7 @@ def build_options_array(option_rows: List[Dict], valid_sizes: set = None, valid_
         # size 옵션이고 details_json이 있으면 details 추가
         if row['option_type'] == 'size' and row.get('details_json'):
             try:
-                details = json.loads(row['details_json'])
+                details = load_details(row['details_json'])
                 if details:
                     # ★ category_id 기준 허용 키 필터링
                     if category_id:
@@ -416,97 +543,10 @@ def build_request_json(product: Dict, images: List[Dict], options: List[Dict], v
     # [{"number": "...", "memo": ""}, ...] 형식
     style_numbers = [{"number": num, "memo": ""} for num in model_no_list]
 
-    # 2. 고정 공지사항 (comments) - 한국어 완벽 제거
-    fixed_comments = """☆☆☆ ご購入前にご確認ください ☆☆☆
-
-◆商品は直営店をはじめ、 デパート、 公式オンラインショップ、ショッピングモールなどの正規品を取り扱う店舗にて買い付けております。100％正規品ですのでご安心ください。
-
-◆「あんしんプラス」へご加入の場合、「サイズがあわない」「イメージと違う」場合に「返品補償制度」をご利用頂けます。
-※「返品対象商品」に限ります。詳しくは右記URLをご参照ください。https://qa.buyma.com/trouble/5206.html
-
-◆ご注文～お届けまで
-手元在庫有：【ご注文確定】 →【梱包】 → 【発送】 → 【お届け】
-手元在庫無し：【ご注文確定】 →【買付】 →【検品】 →【梱包】 →【発送】→【お届け】
-
-◆配送方法/日数
-通常国際便（SAGAWA）：【商品準備2-5日 】+ 【発送～お届け5-9日】
-※平常時の目安です。繁忙期/非常時はお届け日が前後する場合もございます。詳しくはお問合せください。
-※当店では検品時に不良/不具合がある場合は良品に交換をしてお送りしております。当理由でお時間を頂戴する場合は都度ご報告させて頂いております。
-
-◆「お荷物追跡番号あり」にて配送しますので、随時、配送状況をご確認いただけます。
-◆土・日・祝日は発送は休務のため、休み明けに順次発送となります。
-
-◆海外製品は「MADE IN JAPAN」の製品に比べて、若干見劣りする場合もございます。
-返品・交換にあたる不具合の条件に関しては「お取引について」をご確認ください。
-
-◆当店では、日本完売品、日本未入荷アイテム、限定品、
-メンズ、レディース、キッズの シューズ（スニーカー等）や衣類をメインに取り扱っております。
-(カップル,ファミリー、ペアルック、親子リンク)
-韓国の最新トレンドや新作アイテムを順次出品しており、
-
-◆交換・返品・キャンセル
-返品と交換に関する規定は、バイマ規定によりお客様の理由による返品はお受けいたしかねますので、ご購入には慎重にお願いいたします。
-不良品・誤配送は交換、または返品が可能です。
-モニター環境による色違い、サイズ測定方法による1~3cm程度の誤差、糸くず、糸の始末などは欠陥でみなされません。
-製品の大きさは測定方法によって1~3cm程度の誤差が生じることがありますが、欠陥ではございません。
-
-◆不良品について
-検品は行っておりますが、海外製品は日本商品よりも検品基準が低いです。
-下記の理由は返品や交換の原因にはなりません。
-- 縫製の粗さ
-- 縫い終わり部分の糸が切れていないで残っている
-- 生地の色ムラ
-- ミリ段位の傷
-- 若干の汚れ、シミ
-- 製造過程での接着剤の付着など"""
-
-    # 2. 색상/사이즈 보충 정보 푸터 섹션별 분리 (뒤 섹션부터 제거)
-    colorsize_footer_sections = [
-        """
-
-★最安値に挑戦中！★
-本商品は、私たちKONNECT（コネクト）が
-お客様に少しでもお安く提供できるよう、
-最安値での出品に努めた商品です。
-出品時の市場価格調査はもちろん、
-定期的にも価格チェックを行っております。
-（※ただし、価格はリアルタイムで変動するため、
-タイミングによっては最安値ではなくなる場合もございます。
-あらかじめご了承ください。）""",
-        """
-
-★追加料金は一切なし！★
-BUYMAでの決済金額以外、追加費用は一切かかりませんのでご安心ください。
-関税・消費税・送料はすべて商品価格に含まれております。お客様が追加で支払う必要はございません。""",
-        """
-
-★安心の追跡付き発送★
-KONNECT（コネクト）では、すべて追跡可能な配送方法でお届けいたします。
-商品発送後、1〜2日ほどでBUYMA上にて追跡番号をご確認いただけます""",
-        """
-
-★ご購入前の在庫確認のお願い★
-在庫状況はリアルタイムではなく、人気の商品は注文時す
-でに《欠品》となっている可能性もございます。
-確実でスピーディーなお取引と、注文確定後のキャンセル
-によるお客様のご負担をなくすため、ご注文手続きの前に
-【在庫確認】のご協力をお願いしております。
-ご検討されている方も、お気軽にお問い合わせ欄からお声
-掛け下さいませ。""",
-        """
-
-※ 上記参考価格は現地参考価格を10KRW ＝ 1.1円で換算したものです
-※仕入れはデパートや公式オンラインショップなど、100％正規品のみ扱っております"""
-    ]
 
     # available_until: 항상 현재시각 + 90일
     available_until_str = (datetime.now() + timedelta(days=90)).strftime('%Y/%m/%d')
 
-    # 배송 방법 배열 구성 (객체 배열 형식으로 복구)
-    shipping_methods = [
-        {"shipping_method_id": sm_id} for sm_id in BUYMA_FIXED_VALUES['shipping_methods']
-    ]
-
     # ★ 신규 등록: 현재 값 사용 (locked_* 체크 불필요)
     api_name = product['name']
     api_brand_id = product['brand_id']
@@ -526,26 +566,22 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
     # ★ options 필터링: variants에 있는 size/color만 포함 + category_id별 size_details 키 필터링
     filtered_options = build_options_array(options, valid_sizes, valid_colors, category_id=int(api_category_id))
 
+    # 상품마다 같은 값(control·지역·배송·테마·관세)은 _BASE_REQUEST 에서 한 번에 펼친다.
     request_data = {
+        **_BASE_REQUEST,
         # 필수 필드
-        "control": "publish",
         "name": truncate_buyma_name(api_name),
-        "comments": f"{api_name}\n{model_no_text}\n\n{fixed_comments}" if model_no_text else f"{api_name}\n\n{fixed_comments}",
+        "comments": f"{api_name}\n{model_no_text}\n\n{FIXED_COMMENTS}" if model_no_text else f"{api_name}\n\n{FIXED_COMMENTS}",
         "brand_id": int(api_brand_id) if api_brand_id else 0,
         "category_id": int(api_category_id),
         "price": int(product['price']),
         "available_until": available_until_str,
-        "buying_area_id": BUYMA_FIXED_VALUES['buying_area_id'],
-        "shipping_area_id": BUYMA_FIXED_VALUES['shipping_area_id'],
-        "shipping_methods": shipping_methods,
         "images": build_images_array(images),
         "options": filtered_options,  # ★ 필터링된 options
         "variants": variants,
         "order_quantity": random.randint(90, 100), # purchase_for_order 사용 시 필수 항목
         # 선택 필드
         "reference_number": api_reference_number,
-        "theme_id": BUYMA_FIXED_VALUES['theme_id'],
-        "duty": BUYMA_FIXED_VALUES['duty'],
     }
 
     # brand_id=0인 경우 (바이마 미등록 브랜드) brand_name 추가, style_numbers 제외
@@ -589,8 +625,8 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
     end_idx = 0  # 기본값: 아무것도 안 붙임
 
     cumulative_len = 0
-    for i in range(len(colorsize_footer_sections)):
-        section_len = len(colorsize_footer_sections[i])
+    for i in range(len(COLORSIZE_FOOTER_SECTIONS)):
+        section_len = len(COLORSIZE_FOOTER_SECTIONS[i])
         if cumulative_len + section_len <= remaining:
             cumulative_len += section_len
             end_idx = i + 1
@@ -598,7 +634,7 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
             break
 
     # 선택된 섹션들만 합쳐서 footer 생성
-    colorsize_footer = ''.join(colorsize_footer_sections[:end_idx])
+    colorsize_footer = ''.join(COLORSIZE_FOOTER_SECTIONS[:end_idx])
     request_data['colorsize_comments'] = base_colorsize + colorsize_footer
 
     # 최상위를 'product' 키로 감싸서 반환 (바이마 API 필수 규격)
@@ -609,6 +645,46 @@ KONNECT（コネクト）では、すべて追跡可能な配送方法でお届
 # 바이마 API 호출
 # =====================================================
 
+# 바이마 API 전용 세션. 출품 POST 는 멱등이 아니므로 서버가 받지 않은 게 확실한 경우만 재시도한다
+#   - 429/503 (처리 전 거절), 연결 실패(요청이 나가기 전)
+#   - 500/502/504·응답 대기 타임아웃은 이미 등록됐을 수 있어 재시도 안 함 (중복 출품 방지)
+#   Retry-After 헤더가 오면 그 시간만큼 기다린다. 요청서를 다시 만들 필요가 없다.
+_API_RETRY = Retry(
+    total=3,
+    connect=3,
+    read=0,
+    other=0,
+    backoff_factor=0.5,
+    status_forcelist=(429, 503),
+    allowed_methods=frozenset({'POST'}),
+    respect_retry_after_header=True,
+    raise_on_status=False,  # 재시도 끝나도 실패면 예외 대신 마지막 응답을 돌려준다
+)
+_api_session = requests.Session()
+_api_session.mount('https://', HTTPAdapter(max_retries=_API_RETRY))
+
+
+def _retry_count(response) -> int:
+    """urllib3 가 이 응답을 받기까지 재시도한 횟수"""
+    retries = getattr(response.raw, 'retries', None)
+    return len(retries.history) if retries else 0
+
+
+def _json_default(obj):
+    """DB 에서 온 Decimal 이 섞여 있어도 직렬화되도록"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def _dump_request(request_data: Dict) -> bytes:
+    """요청 본문을 bytes 로 직렬화. orjson 이 없으면 표준 json (공백 없는 형태)."""
+    if orjson is not None:
+        return orjson.dumps(request_data, default=_json_default)
+    return json.dumps(request_data, ensure_ascii=False, separators=(',', ':'),
+                      default=_json_default).encode('utf-8')
+
+
 def call_buyma_api(request_data: Dict) -> Dict:
     """
     바이마 상품 등록 API 호출
@@ -621,34 +697,37 @@ def call_buyma_api(request_data: Dict) -> Dict:
     }
 
     try:
-        response = requests.post(
+        response = _api_session.post(
             url,
             headers=headers,
-            json=request_data,
+            data=_dump_request(request_data),
             timeout=30
         )
+        retries = _retry_count(response)
 
-        log(f"API 응답 코드: {response.status_code}")
+        log(f"API 응답 코드: {response.status_code}" + (f" (재시도 {retries}회)" if retries else ""))
 
         if response.status_code in [200, 201, 202]:
             return {
                 "success": True,
                 "status_code": response.status_code,
                 "response": response.json() if response.text else {},
-                "headers": dict(response.headers)
+                "headers": dict(response.headers),
+                "retries": retries
             }
         else:
             return {
                 "success": False,
                 "status_code": response.status_code,
                 "error": response.text,
-                "headers": dict(response.headers)
+                "headers": dict(response.headers),
+                "retries": retries
             }
 
-    except requests.exceptions.Timeout:
-        return {"success": False, "error": "Request timeout"}
     except requests.exceptions.RequestException as e:
-        return {"success": False, "error": str(e)}
+        # 연결 실패는 재시도(_API_RETRY)까지 다 소진된 뒤에, 응답 대기 타임아웃은 재시도 없이 바로 여기로 온다.
+        error = "Request timeout" if isinstance(e, requests.exceptions.Timeout) else str(e)
+        return {"success": False, "error": error}
 
 
 def call_buyma_variants_soldout(reference_number: str, option_rows: list) -> Dict:
@@ -680,7 +759,7 @@ def call_buyma_variants_soldout(reference_number: str, option_rows: list) -> Dic
         }
     }
     try:
-        response = requests.post(url, headers=headers, json=request_data, timeout=30)
+        response = requests.post(url, headers=headers, data=_dump_request(request_data), timeout=30)
         log(f"  품절(재고API) 응답 코드: {response.status_code}")
         if response.status_code in [200, 201, 202]:
             return {
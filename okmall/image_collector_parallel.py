@@ -16,28 +16,35 @@ Playwright 기반 - 멀티프로세싱 병렬 처리 버전
     python image_collector_parallel.py --dry-run            # 테스트 (DB 저장 안함)
     python image_collector_parallel.py --headless=false     # 브라우저 표시 (디버깅용)
     python image_collector_parallel.py --workers=4          # 동시 처리 워커 수 (기본 4)
+    python image_collector_parallel.py --no-search-cache    # 같은 모델번호도 매번 다시 검색
+    python image_collector_parallel.py --cdp-endpoint=http://127.0.0.1:9222  # 미리 띄운 Chromium 공유
+        (Chromium 을 --remote-debugging-port=9222 로 먼저 실행 — 워커마다 브라우저를 새로 띄우지 않음)
 
 설치:
-    pip install playwright sqlalchemy pymysql
+    pip install playwright sqlalchemy pymysql requests
     playwright install chromium
 
 작성일: 2026-01-19
 """
 
 import argparse
+import html as html_lib
 import re
 import time
 import random
 import sys
 import io
 import multiprocessing as mp
-from datetime import datetime
+import queue
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 
 import os
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, create_engine, text
 from dotenv import load_dotenv
 
 load_dotenv(os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env'))
@@ -61,11 +68,16 @@ WCONCEPT_PRODUCT_URL = "https://www.wconcept.co.kr/Product/{product_id}"
 REQUEST_DELAY_MIN = 1.0
 REQUEST_DELAY_MAX = 2.0
 
-# 페이지 로딩 타임아웃 (밀리초)
+# 페이지 로딩 타임아웃 (밀리초) — 기본값, 페이지 이동은 아래 개별 상한 사용
 PAGE_TIMEOUT = 30000
+SEARCH_NAV_TIMEOUT = 8000       # 검색 페이지 이동 (응답 없는 검색에 30초씩 묶이지 않게)
+DETAIL_NAV_TIMEOUT = 15000      # 상세 페이지 이동
 
-# 페이지 렌더링 대기 (밀리초)
-PAGE_RENDER_WAIT = 2000
+# 페이지 렌더링 대기 상한 (밀리초) — 고정 대기 대신 요소가 붙는 즉시 진행
+PAGE_RENDER_WAIT = 2000     # 검색 결과 영역(sortingbar)이 이 안에 없으면 결과 없음
+SELECTOR_TIMEOUT = 5000     # 상품 목록 요소 대기 상한
+# 상세 페이지는 goto 를 'commit' 에서 끝내므로 본문 다운로드·렌더링까지 이 대기 안에서 끝나야 한다
+GALLERY_WAIT_TIMEOUT = 10000  # 갤러리 요소 대기 상한 (느린 페이지를 'not found' 로 적지 않도록 넉넉히)
 
 # 최대 이미지 수 (바이마 제한: 20장)
 MAX_IMAGES = 20
@@ -82,6 +94,56 @@ DEFAULT_WORKERS = 4
 # 워커별 중간 저장 단위
 BATCH_SAVE_SIZE = 10
 
+# 워커 안 상품 ID → 이미지 URL 캐시 상한 (긴 실행에서 메모리 무한 증가 방지)
+IMAGE_CACHE_MAX = 5000
+
+# 워커가 이 개수만큼 처리하면 브라우저 컨텍스트(탭)를 새로 만듦
+CONTEXT_RECYCLE_AFTER = 200
+
+# 상세 페이지 HTTP 직접 요청 (브라우저 없이 갤러리 속성만 읽음, 실패 시 Playwright 폴백)
+HTTP_TIMEOUT = 15
+HTTP_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36'
+# 응답 본문(bytes)에 바로 적용 — 페이지 전체 디코딩·charset 추정 없이 갤러리 속성만 꺼냄
+ZOOM_IMAGE_RE = re.compile(rb'data-zoom-image\s*=\s*["\']([^"\']+)["\']')
+# id="gallery" 가 붙은 여는 태그의 이름 (짝이 맞는 닫는 태그까지를 갤러리 범위로 잡는다)
+TAG_NAME_RE = re.compile(rb'<([A-Za-z][A-Za-z0-9]*)')
+# 검색 결과 이미지 src / 상품 링크 href 에서 상품 ID 추출
+PRODUCT_IMG_ID_RE = re.compile(r'/(\d{8,})_')
+PRODUCT_HREF_ID_RE = re.compile(r'/Product/(\d+)')
+
+# 페이지 요소 셀렉터 (대기·추출에서 같은 문자열 공유)
+SEARCH_BAR_SELECTOR = '.search-results-sortingbar'
+PRODUCT_ITEM_SELECTOR = '.product-item'
+GALLERY_ZOOM_SELECTOR = '#gallery li a[data-zoom-image]'
+
+# 검색 결과 영역의 이미지 src·상품 링크 href 를 한 번에 읽는 스크립트 (요소별 get_attribute 왕복 제거)
+# 추천 상품 영역: product-list area-rec-prd-list / 실제 검색 영역: product-list (area-rec-prd-list 없음)
+SEARCH_RESULT_JS = """() => {
+    const area = document.querySelector('.product-list:not(.area-rec-prd-list)');
+    if (!area) return null;
+    return {
+        srcs: Array.from(area.querySelectorAll('.product-item img'), el => el.getAttribute('src') || ''),
+        hrefs: Array.from(area.querySelectorAll('a[href*="/Product/"]'), el => el.getAttribute('href') || ''),
+    };
+}"""
+
+# 갤러리 zoom URL (중복은 브라우저 쪽에서 먼저 제거 — 썸네일 중복이 많은 상품도 전송량 최소화)
+GALLERY_ZOOM_JS = """(selector) => [...new Set(Array.from(
+    document.querySelectorAll(selector),
+    el => el.getAttribute('data-zoom-image') || ''
+))]"""
+
+# 브라우저에서 받지 않을 리소스 (URL 은 DOM 속성에서 읽으므로 이미지 본문·폰트·영상·CSS 는 불필요)
+#   CSS 를 끊으므로 요소 대기는 화면 표시(visible)가 아니라 DOM 부착(attached) 기준으로 한다.
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'media', 'stylesheet'})
+BLOCKED_URL_KEYWORDS = ('google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+                        'facebook.net', 'criteo.', 'braze.')
+
+# 브라우저 실행 단계에서 이미지 로딩·GPU·오디오 자체를 끔 (route 차단 전에 시작되는 요청까지 방지)
+#   이미지 load 이벤트에 의존하는 셀렉터가 생기면 False 로
+DISABLE_IMAGES_AT_LAUNCH = True
+NO_IMAGE_LAUNCH_ARGS = ['--blink-settings=imagesEnabled=false', '--disable-gpu', '--mute-audio']
+
 
 # =====================================================
 # 데이터 클래스 (pickle 호환을 위해 모듈 레벨에 정의)
@@ -111,43 +173,166 @@ class ProductImageResult:
 # 유틸리티 함수
 # =====================================================
 
+_log_ts_cache = [0, ""]          # [초 단위 epoch, 포맷된 문자열] — 같은 초 안에서는 strftime 재사용 (프로세스별)
+
+
 def log(message: str, level: str = "INFO", worker_id: int = None) -> None:
     """로그 출력"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    t = int(time.time())
+    if t != _log_ts_cache[0]:
+        _log_ts_cache[:] = [t, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))]
+    timestamp = _log_ts_cache[1]
     worker_tag = f"[W{worker_id}]" if worker_id is not None else ""
     print(f"[{timestamp}] [{level}] {worker_tag} {message}", flush=True)
 
 
+_last_request_at = [0.0]         # 마지막 W컨셉 요청 시작 시각 (monotonic, 프로세스별)
+
+
+def mark_request() -> None:
+    """W컨셉 요청 시작 기록 (random_delay 간격 기준점)"""
+    _last_request_at[0] = time.monotonic()
+
+
 def random_delay() -> None:
-    """랜덤 딜레이"""
-    delay = random.uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX)
-    time.sleep(delay)
+    """랜덤 딜레이 — 직전 요청 시작부터 REQUEST_DELAY_MIN~MAX 초 간격 (요청에 이미 걸린 시간은 빼고 대기)"""
+    delay = random.uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX) - (time.monotonic() - _last_request_at[0])
+    if delay > 0:
+        time.sleep(delay)
+
+
+def block_heavy_resources(route) -> None:
+    """이미지·폰트·영상·분석 스크립트 요청은 끊고 나머지만 통과 (페이지 로딩 바이트 절감)"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(k in request.url for k in BLOCKED_URL_KEYWORDS):
+        route.abort()
+    else:
+        route.continue_()
 
 
 def normalize_image_url(url: str) -> str:
-    """이미지 URL 정규화"""
+    """이미지 URL 정규화 (스킴 없는 // 주소 보정, ?thumbnail 이하 제거)"""
     if not url:
         return ""
     if url.startswith("//"):
-        url = f"https:{url}"
+        url = "https:" + url
     if "?thumbnail" in url:
-        url = url.split("?")[0]
+        url = url.partition("?")[0]  # 첫 ? 앞만 쓰므로 전체 split 불필요
     return url
 
 
+def collect_zoom_images(zoom_urls: List[str]) -> List[str]:
+    """zoom URL 목록 → 정규화·중복 제거한 이미지 URL (순서 유지, 최대 MAX_IMAGES)"""
+    images = []
+    seen = set()
+    for zoom_url in zoom_urls:
+        normalized = normalize_image_url(zoom_url)
+        if normalized and normalized not in seen:
+            seen.add(normalized)
+            images.append(normalized)
+            if len(images) >= MAX_IMAGES:
+                break
+    return images
+
+
+def _replace_images(conn, results: List[ProductImageResult]) -> int:
+    """여러 상품의 이미지를 한 번에 교체 (기존 행 DELETE ... IN 1회 + 새 행 executemany 1회)"""
+    conn.execute(
+        text("""
+            DELETE FROM ace_product_images
+            WHERE ace_product_id IN :ids
+        """).bindparams(bindparam('ids', expanding=True)),
+        {'ids': [r.ace_product_id for r in results]}
+    )
+    rows = [{
+        'ace_product_id': img.ace_product_id,
+        'position': img.position,
+        'source_image_url': img.source_image_url,
+        'is_uploaded': img.is_uploaded
+    } for r in results for img in r.images]
+    if rows:
+        # 파라미터 리스트 → executemany (pymysql 이 여러 행짜리 INSERT 로 묶어 보냄)
+        conn.execute(text("""
+            INSERT INTO ace_product_images (
+                ace_product_id, position, source_image_url, is_uploaded
+            ) VALUES (
+                :ace_product_id, :position, :source_image_url, :is_uploaded
+            )
+        """), rows)
+    return len(rows)
+
+
+def replace_product_images(conn, results: List[ProductImageResult]) -> Tuple[int, List[ProductImageResult]]:
+    """
+    여러 상품의 이미지를 교체. 묶음 전체를 savepoint 하나로 먼저 시도하고,
+    실패하면 그 savepoint 만 되돌린 뒤 상품마다 savepoint 를 따로 잡아 다시 한다
+    → INSERT 가 중간에 실패해도 그 상품만 기존 이미지가 남고, 다른 상품 이미지는 지워지지 않는다.
+    커밋은 호출부가 한다.
+    Returns: (INSERT 한 이미지 수, 저장 실패한 상품 결과 목록)
+    """
+    if not results:
+        return 0, []
+    try:
+        with conn.begin_nested():
+            return _replace_images(conn, results), []
+    except Exception as e:
+        if len(results) == 1:
+            log(f"DB 저장 오류 (ace_product_id={results[0].ace_product_id}): {e}", "ERROR")
+            return 0, list(results)
+
+    inserted, failed = 0, []
+    for result in results:
+        try:
+            with conn.begin_nested():
+                inserted += _replace_images(conn, [result])
+        except Exception as e:
+            log(f"DB 저장 오류 (ace_product_id={result.ace_product_id}): {e}", "ERROR")
+            failed.append(result)
+    return inserted, failed
+
+
 # =====================================================
 # 워커 함수 (별도 프로세스에서 실행)
 # =====================================================
 
-def worker_process(worker_id: int, products: List[Dict], total: int, headless: bool, dry_run: bool, result_queue: mp.Queue):
+def open_browser_page(browser: Browser) -> Tuple[BrowserContext, Page]:
+    """수집용 컨텍스트 + 페이지 생성 (자동화 흔적 숨김·무거운 리소스 차단 포함)"""
+    context = browser.new_context(
+        viewport={'width': 1920, 'height': 1080},
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36',
+        locale='ko-KR',
+        timezone_id='Asia/Seoul',
+    )
+
+    context.add_init_script("""
+        Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+        Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
+        Object.defineProperty(navigator, 'languages', { get: () => ['ko-KR', 'ko', 'en-US', 'en'] });
+        window.chrome = { runtime: {} };
+    """)
+    context.route("**/*", block_heavy_resources)
+
+    page = context.new_page()
+    page.set_default_timeout(PAGE_TIMEOUT)
+    # 렌더러가 죽은 탭은 닫아 둠 → 워커 루프가 is_closed() 로 보고 새 컨텍스트로 교체
+    page.on("crash", lambda crashed_page: crashed_page.close())
+    return context, page
+
+
+def worker_process(worker_id: int, task_queue: mp.Queue, total: int, headless: bool, dry_run: bool, result_queue: mp.Queue,
+                   use_search_cache: bool = True, cdp_endpoint: Optional[str] = None):
     """
     워커 프로세스 - 독립적인 브라우저로 상품 수집
-    50개마다 중간 저장
+    task_queue 에서 상품을 하나씩 꺼내 처리 (None 을 받으면 종료)
+    BATCH_SAVE_SIZE 개마다 중간 저장
+    use_search_cache: 같은 모델번호(여러 수집처에 같은 상품) 검색 결과·상품 이미지를 워커 안에서 재사용
+    cdp_endpoint: 있으면 브라우저를 띄우지 않고 이미 실행 중인 Chromium 에 붙어 워커 전용 컨텍스트만 생성
     """
-    from sqlalchemy import create_engine, text
+    from sqlalchemy import create_engine
     
     # 워커별 DB 연결 (각 프로세스가 독립적으로 연결)
-    engine = create_engine(DB_URL)
+    # 중간 저장 사이에 크롤링으로 수 분씩 놀 수 있어 끊긴 연결은 꺼내기 전에 확인·교체
+    engine = create_engine(DB_URL, pool_pre_ping=True, pool_recycle=280)
     
     # 통계
     stats = {
@@ -160,6 +345,11 @@ def worker_process(worker_id: int, products: List[Dict], total: int, headless: b
     # 중간 저장용 버퍼
     buffer = []
 
+    # 모델번호 → W컨셉 상품 ID 후보 (워커 프로세스 안에서만 유지)
+    search_cache: Optional[Dict[str, List[str]]] = {} if use_search_cache else None
+    # W컨셉 상품 ID → 이미지 URL (다른 모델번호가 같은 상품으로 검색되는 경우 포함)
+    image_cache: Optional[Dict[str, List[str]]] = {} if use_search_cache else None
+
     def save_buffer():
         """버퍼에 쌓인 결과를 DB에 저장"""
         nonlocal buffer
@@ -182,31 +372,16 @@ def worker_process(worker_id: int, products: List[Dict], total: int, headless: b
         
         try:
             with engine.connect() as conn:
-                for result in buffer:
-                    # 기존 이미지 삭제
-                    conn.execute(text("""
-                        DELETE FROM ace_product_images
-                        WHERE ace_product_id = :ace_product_id
-                    """), {'ace_product_id': result.ace_product_id})
-
-                    # 새 이미지 저장
-                    for img in result.images:
-                        conn.execute(text("""
-                            INSERT INTO ace_product_images (
-                                ace_product_id, position, source_image_url, is_uploaded
-                            ) VALUES (
-                                :ace_product_id, :position, :source_image_url, :is_uploaded
-                            )
-                        """), {
-                            'ace_product_id': img.ace_product_id,
-                            'position': img.position,
-                            'source_image_url': img.source_image_url,
-                            'is_uploaded': img.is_uploaded
-                        })
-                        stats['total_images'] += 1
+                # 기존 이미지 삭제 + 새 이미지 저장 (버퍼 전체를 한 번에, 실패 상품만 되돌림)
+                inserted, failed = replace_product_images(conn, buffer)
+                stats['total_images'] += inserted
+                failed_ids = {id(r) for r in failed}
 
+                for result in buffer:
                     # 통계 업데이트
-                    if result.status == "success":
+                    if id(result) in failed_ids:
+                        stats['error'] += 1
+                    elif result.status == "success":
                         stats['success'] += 1
                     elif result.status == "not_found":
                         stats['not_found'] += 1
@@ -223,40 +398,51 @@ def worker_process(worker_id: int, products: List[Dict], total: int, headless: b
 
     try:
         with sync_playwright() as playwright:
-            # 브라우저 시작
-            browser = playwright.chromium.launch(
-                headless=headless,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                ]
-            )
-
-            context = browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36',
-                locale='ko-KR',
-                timezone_id='Asia/Seoul',
-            )
+            # 브라우저 시작 (공유 Chromium 이 있으면 연결만 — 실행 인자는 그쪽 실행 시 설정)
+            if cdp_endpoint:
+                browser = playwright.chromium.connect_over_cdp(cdp_endpoint)
+            else:
+                browser = playwright.chromium.launch(
+                    headless=headless,
+                    args=[
+                        '--disable-blink-features=AutomationControlled',
+                        '--no-sandbox',
+                        '--disable-dev-shm-usage',
+                        # 수집에 필요 없는 백그라운드 기능 끔 (기동 CPU·메모리 절감)
+                        '--disable-extensions',
+                        '--disable-background-networking',
+                        '--disable-component-update',
+                    ] + (NO_IMAGE_LAUNCH_ARGS if DISABLE_IMAGES_AT_LAUNCH else [])
+                )
 
-            context.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-                Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3, 4, 5] });
-                Object.defineProperty(navigator, 'languages', { get: () => ['ko-KR', 'ko', 'en-US', 'en'] });
-                window.chrome = { runtime: {} };
-            """)
+            context, page = open_browser_page(browser)
+            context_uses = 0
 
-            page = context.new_page()
-            page.set_default_timeout(PAGE_TIMEOUT)
+            log("브라우저 시작 완료, 공용 대기열에서 상품 처리", "BROWSER", worker_id)
 
-            log(f"브라우저 시작 완료, {len(products)}개 상품 처리 예정", "BROWSER", worker_id)
+            # 상품 처리 — 미리 나눠 갖지 않고 끝나는 대로 다음 상품을 가져간다 (느린 워커에 일이 몰리지 않음)
+            for product in iter(task_queue.get, None):
+                # 탭이 닫혔으면(렌더러 크래시 등) 새 컨텍스트로 — 남은 상품이 전부 오류로 끝나지 않게
+                if page.is_closed():
+                    try:
+                        context.close()
+                    except Exception:
+                        pass
+                    context, page = open_browser_page(browser)
+                    context_uses = 0
+                    log("페이지가 닫혀 브라우저 컨텍스트 재생성", "BROWSER", worker_id)
 
-            # 상품 처리
-            for i, product in enumerate(products):
                 idx = product.get('_idx', 0)
-                result = collect_single_product(page, product, worker_id, idx, total)
+                result = collect_single_product(page, product, worker_id, idx, total, search_cache, image_cache)
                 buffer.append(result)
+
+                # 컨텍스트 재생성 — 긴 실행에서 탭 메모리·쿠키·캐시가 계속 쌓이지 않게 (브라우저는 유지)
+                context_uses += 1
+                if context_uses >= CONTEXT_RECYCLE_AFTER:
+                    context.close()
+                    context, page = open_browser_page(browser)
+                    context_uses = 0
+                    log(f"브라우저 컨텍스트 재생성 ({CONTEXT_RECYCLE_AFTER}개 처리)", "BROWSER", worker_id)
                 
                 # 50개마다 중간 저장
                 if len(buffer) >= BATCH_SAVE_SIZE:
@@ -265,7 +451,7 @@ def worker_process(worker_id: int, products: List[Dict], total: int, headless: b
             # 남은 버퍼 저장
             save_buffer()
 
-            # 브라우저 종료
+            # 브라우저 종료 (공유 Chromium 이면 이 워커의 컨텍스트 정리 후 연결만 끊김)
             context.close()
             browser.close()
 
@@ -278,8 +464,10 @@ def worker_process(worker_id: int, products: List[Dict], total: int, headless: b
     result_queue.put(stats)
 
 
-def collect_single_product(page: Page, product: Dict, worker_id: int, idx: int, total: int) -> ProductImageResult:
-    """단일 상품 수집"""
+def collect_single_product(page: Page, product: Dict, worker_id: int, idx: int, total: int,
+                           search_cache: Optional[Dict[str, List[str]]] = None,
+                           image_cache: Optional[Dict[str, List[str]]] = None) -> ProductImageResult:
+    """단일 상품 수집 (캐시가 있으면 같은 모델번호 재검색·같은 상품 재조회 생략)"""
     ace_product_id = product['id']
     model_no = product['model_no']
 
@@ -291,9 +479,17 @@ def collect_single_product(page: Page, product: Dict, worker_id: int, idx: int,
     )
 
     try:
-        # 1. W컨셉 검색
-        product_ids = search_wconcept_products(page, model_no, worker_id)
-        random_delay()
+        # 1. W컨셉 검색 (캐시 적중 시 검색 페이지 이동·딜레이 생략)
+        cache_key = model_no.strip().upper()
+        product_ids = search_cache.get(cache_key) if search_cache is not None else None
+        if product_ids:
+            log(f"=> 검색 캐시 사용: {product_ids}", "DEBUG", worker_id)
+        else:
+            product_ids = search_wconcept_products(page, model_no, worker_id)
+            # 결과 없음과 검색 오류가 둘 다 [] 라 찾은 경우만 저장
+            if product_ids and search_cache is not None:
+                search_cache[cache_key] = product_ids
+            random_delay()
 
         if not product_ids:
             result.status = "not_found"
@@ -306,7 +502,7 @@ def collect_single_product(page: Page, product: Dict, worker_id: int, idx: int,
             return result
 
         # 2. 최적의 상품 선택
-        selected_id, image_urls = select_best_product(page, product_ids, worker_id)
+        selected_id, image_urls = select_best_product(page, product_ids, worker_id, image_cache)
         random_delay()
 
         if not selected_id or not image_urls:
@@ -355,34 +551,30 @@ def search_wconcept_products(page: Page, model_no: str, worker_id: int) -> List[
     search_url = f"{WCONCEPT_SEARCH_URL}?keyword={keyword}&type=direct"
 
     try:
-        page.goto(search_url, wait_until='domcontentloaded')
-        page.wait_for_timeout(PAGE_RENDER_WAIT)
+        mark_request()
+        page.goto(search_url, wait_until='domcontentloaded', timeout=SEARCH_NAV_TIMEOUT)
 
-        # 검색 결과 확인
-        sorting_bar = page.query_selector('.search-results-sortingbar')
-        if not sorting_bar:
+        # 검색 결과 확인 (예전 고정 대기 시간 안에 결과 영역이 안 붙으면 결과 없음)
+        try:
+            page.wait_for_selector(SEARCH_BAR_SELECTOR, state='attached', timeout=PAGE_RENDER_WAIT)
+        except:
             return []
 
         try:
-            page.wait_for_selector('.product-item', timeout=10000)
+            page.wait_for_selector(PRODUCT_ITEM_SELECTOR, state='attached', timeout=SELECTOR_TIMEOUT)
         except:
             return []
 
         product_ids = []
 
-        # 실제 검색 결과 영역만 선택 (추천 상품 영역 제외)
-        # 추천 상품 영역: product-list area-rec-prd-list
-        # 실제 검색 영역: product-list (area-rec-prd-list 없음)
-        search_result_area = page.query_selector('.product-list:not(.area-rec-prd-list)')
-
-        if not search_result_area:
+        # 실제 검색 결과 영역만 (추천 상품 영역 제외) — src/href 를 evaluate 1회로 읽음
+        found = page.evaluate(SEARCH_RESULT_JS)
+        if not found:
             return []
 
         # 이미지에서 상품 ID 추출 (검색 결과 영역 내에서만)
-        product_items = search_result_area.query_selector_all('.product-item img')
-        for img in product_items:
-            src = img.get_attribute('src') or ''
-            match = re.search(r'/(\d{8,})_', src)
+        for src in found['srcs']:
+            match = PRODUCT_IMG_ID_RE.search(src)
             if match:
                 product_id = match.group(1)
                 if product_id not in product_ids:
@@ -392,10 +584,8 @@ def search_wconcept_products(page: Page, model_no: str, worker_id: int) -> List[
 
         # 링크에서 상품 ID 추출 (검색 결과 영역 내에서만)
         if len(product_ids) < 2:
-            links = search_result_area.query_selector_all('a[href*="/Product/"]')
-            for link in links:
-                href = link.get_attribute('href') or ''
-                match = re.search(r'/Product/(\d+)', href)
+            for href in found['hrefs']:
+                match = PRODUCT_HREF_ID_RE.search(href)
                 if match:
                     product_id = match.group(1)
                     if product_id not in product_ids:
@@ -410,26 +600,93 @@ def search_wconcept_products(page: Page, model_no: str, worker_id: int) -> List[
         return []
 
 
+_http_session: Optional[requests.Session] = None
+
+
+def get_http_session() -> requests.Session:
+    """프로세스(워커)마다 하나씩 쓰는 keep-alive 세션"""
+    global _http_session
+    if _http_session is None:
+        _http_session = requests.Session()
+        # 429/5xx 는 잠깐 쉬었다 재시도 (Retry-After 존중) — 일시 오류로 브라우저 폴백·not found 되는 것 방지
+        _http_session.mount('https://', HTTPAdapter(max_retries=Retry(
+            total=2, backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({'GET'}),
+            respect_retry_after_header=True,
+            raise_on_status=False)))
+        _http_session.headers.update({
+            'User-Agent': HTTP_USER_AGENT,
+            'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+            'Referer': 'https://display.wconcept.co.kr/',
+        })
+    return _http_session
+
+
+def _gallery_fragment(body: bytes) -> Optional[bytes]:
+    """
+    본문에서 id="gallery" 요소(여는 태그 ~ 짝이 맞는 닫는 태그)만 잘라낸다.
+    뒤쪽 다른 위젯(추천 상품 등)의 data-zoom-image 가 섞이지 않도록. 못 찾으면 None.
+    """
+    pos = body.find(b'id="gallery"')
+    if pos < 0:
+        return None
+    tag_start = body.rfind(b'<', 0, pos)
+    m = TAG_NAME_RE.match(body, tag_start) if tag_start >= 0 else None
+    if not m:
+        return None
+    tag = m.group(1).lower()
+    # 같은 이름의 태그가 안에 중첩될 수 있으므로 깊이를 세어 짝이 맞는 닫는 태그를 찾는다
+    tag_re = re.compile(rb'<(/?)' + re.escape(tag) + rb'[\s>/]', re.IGNORECASE)
+    depth = 0
+    for t in tag_re.finditer(body, tag_start):
+        depth += -1 if t.group(1) else 1
+        if depth == 0:
+            return body[tag_start:t.end()]
+    return None
+
+
+def fetch_product_images_http(product_id: str) -> Optional[List[str]]:
+    """
+    상세 페이지를 브라우저 없이 받아 #gallery 의 data-zoom-image 를 읽는다.
+    차단(403 등)·응답 이상·갤러리 없음이면 None → 호출부가 Playwright 로 다시 시도.
+    """
+    url = WCONCEPT_PRODUCT_URL.format(product_id=product_id)
+    try:
+        mark_request()
+        resp = get_http_session().get(url, timeout=HTTP_TIMEOUT)
+    except requests.RequestException:
+        return None
+    if resp.status_code != 200:
+        return None
+
+    body = resp.content
+    gallery = _gallery_fragment(body)
+    if gallery is None:
+        return None
+
+    zoom_urls = [html_lib.unescape(u.decode('utf-8', 'replace')) for u in ZOOM_IMAGE_RE.findall(gallery)]
+    return collect_zoom_images(zoom_urls) or None
+
+
 def get_product_images(page: Page, product_id: str, worker_id: int) -> List[str]:
-    """상품 이미지 추출"""
+    """상품 이미지 추출 (HTTP 직접 요청 우선, 안 되면 브라우저 렌더링)"""
+    images = fetch_product_images_http(product_id)
+    if images is not None:
+        return images
+
     url = WCONCEPT_PRODUCT_URL.format(product_id=product_id)
 
     try:
-        page.goto(url, wait_until='domcontentloaded')
-        page.wait_for_timeout(PAGE_RENDER_WAIT)
+        # 응답 시작(commit)만 기다리고 갤러리 링크가 붙는 즉시 진행 (DOM 전체 파싱 완료를 따로 기다리지 않음)
+        mark_request()
+        page.goto(url, wait_until='commit', timeout=DETAIL_NAV_TIMEOUT)
 
         images = []
 
         try:
-            page.wait_for_selector('#gallery', timeout=10000)
-            gallery_items = page.query_selector_all('#gallery li a[data-zoom-image]')
-
-            for item in gallery_items:
-                zoom_url = item.get_attribute('data-zoom-image')
-                if zoom_url:
-                    normalized = normalize_image_url(zoom_url)
-                    if normalized and normalized not in images:
-                        images.append(normalized)
+            page.wait_for_selector(GALLERY_ZOOM_SELECTOR, state='attached', timeout=GALLERY_WAIT_TIMEOUT)
+            images = collect_zoom_images(page.evaluate(GALLERY_ZOOM_JS, GALLERY_ZOOM_SELECTOR))
         except:
             pass
 
@@ -440,13 +697,25 @@ def get_product_images(page: Page, product_id: str, worker_id: int) -> List[str]
         return []
 
 
-def select_best_product(page: Page, product_ids: List[str], worker_id: int) -> Tuple[Optional[str], List[str]]:
+def get_product_images_cached(page: Page, product_id: str, worker_id: int,
+                              image_cache: Optional[Dict[str, List[str]]]) -> List[str]:
+    """get_product_images + 워커 내 캐시 (이미지를 찾은 경우만 저장, IMAGE_CACHE_MAX 까지)"""
+    if image_cache is not None and product_id in image_cache:
+        return image_cache[product_id]
+    images = get_product_images(page, product_id, worker_id)
+    if images and image_cache is not None and len(image_cache) < IMAGE_CACHE_MAX:
+        image_cache[product_id] = images
+    return images
+
+
+def select_best_product(page: Page, product_ids: List[str], worker_id: int,
+                        image_cache: Optional[Dict[str, List[str]]] = None) -> Tuple[Optional[str], List[str]]:
     """최적의 상품 선택"""
     if not product_ids:
         return None, []
 
     first_id = product_ids[0]
-    first_images = get_product_images(page, first_id, worker_id)
+    first_images = get_product_images_cached(page, first_id, worker_id, image_cache)
 
     if len(first_images) >= MIN_IMAGE_COUNT:
         return first_id, first_images
@@ -456,7 +725,7 @@ def select_best_product(page: Page, product_ids: List[str], worker_id: int) -> T
 
     random_delay()
     second_id = product_ids[1]
-    second_images = get_product_images(page, second_id, worker_id)
+    second_images = get_product_images_cached(page, second_id, worker_id, image_cache)
 
     if len(second_images) > len(first_images):
         return second_id, second_images
@@ -471,12 +740,14 @@ def select_best_product(page: Page, product_ids: List[str], worker_id: int) -> T
 class WconceptImageCollectorParallel:
     """W컨셉 이미지 수집기 - 멀티프로세싱"""
 
-    def __init__(self, db_url: str, headless: bool = True, num_workers: int = DEFAULT_WORKERS):
-        self.engine = create_engine(db_url)
+    def __init__(self, db_url: str, headless: bool = True, num_workers: int = DEFAULT_WORKERS, cdp_endpoint: str = None):
+        self.engine = create_engine(db_url, pool_pre_ping=True, pool_recycle=280)
         self.headless = headless
         self.num_workers = num_workers
+        self.cdp_endpoint = cdp_endpoint
 
-        log(f"WconceptImageCollectorParallel 초기화 (headless={headless}, workers={num_workers})", "INFO")
+        log(f"WconceptImageCollectorParallel 초기화 (headless={headless}, workers={num_workers}"
+            f"{f', cdp={cdp_endpoint}' if cdp_endpoint else ''})", "INFO")
 
     def fetch_target_products(self, brand: str = None, model_no: str = None, limit: int = None, price_checked_only: bool = False, source_site: str = None) -> List[Dict]:
         """대상 상품 조회"""
@@ -484,12 +755,20 @@ class WconceptImageCollectorParallel:
             query = """
                 SELECT ap.id, ap.model_no, ap.brand_name, ap.name
                 FROM ace_products ap
-                LEFT JOIN ace_product_images api ON ap.id = api.ace_product_id
                 LEFT JOIN mall_sites ms ON ap.source_site = ms.site_name
-                WHERE (api.id IS NULL OR api.source_image_url = 'not found')
-                  AND ap.model_no IS NOT NULL
+                WHERE ap.model_no IS NOT NULL
                   AND ap.model_no != ''
                   AND COALESCE(ms.has_own_images, 0) = 0
+                  -- 실제 이미지(URL 이 NULL 도 'not found' 도 아닌 행)가 하나도 없는 상품만
+                  --   이미지 행 없음 / 'not found'·NULL 행만 있음 → 대상
+                  --   실제 이미지 + 남은 'not found' 행 → 대상 아님 (이미 이미지 있음)
+                  -- 이미지 행 전체를 붙였다 GROUP BY 로 접는 대신 uk_ace_product_position 으로 상품당 1회 탐색
+                  AND NOT EXISTS (
+                      SELECT 1 FROM ace_product_images api
+                      WHERE api.ace_product_id = ap.id
+                        AND api.source_image_url IS NOT NULL
+                        AND api.source_image_url != 'not found'
+                  )
             """
             params = {}
 
@@ -508,22 +787,14 @@ class WconceptImageCollectorParallel:
                 query += " AND ap.source_site = :source_site"
                 params['source_site'] = source_site.lower()
 
-            query += " GROUP BY ap.id ORDER BY ap.id"
+            query += " ORDER BY ap.id"
 
             if limit:
                 query += " LIMIT :limit"
                 params['limit'] = limit
 
-            result = conn.execute(text(query), params)
-
-            products = []
-            for row in result:
-                products.append({
-                    'id': row[0],
-                    'model_no': row[1],
-                    'brand_name': row[2],
-                    'name': row[3]
-                })
+            # 컬럼명 그대로 dict (워커 큐로 pickle 전달 + _idx 추가하므로 일반 dict 로 변환)
+            products = [dict(row) for row in conn.execute(text(query), params).mappings()]
 
             log(f"이미지 수집 대상: {len(products)}개 상품")
             return products
@@ -544,46 +815,30 @@ class WconceptImageCollectorParallel:
         log("DB 저장 시작...", "DB")
 
         with self.engine.connect() as conn:
-            for result in results:
-                try:
-                    conn.execute(text("""
-                        DELETE FROM ace_product_images
-                        WHERE ace_product_id = :ace_product_id
-                    """), {'ace_product_id': result.ace_product_id})
-
-                    for img in result.images:
-                        conn.execute(text("""
-                            INSERT INTO ace_product_images (
-                                ace_product_id, position, source_image_url, is_uploaded
-                            ) VALUES (
-                                :ace_product_id, :position, :source_image_url, :is_uploaded
-                            )
-                        """), {
-                            'ace_product_id': img.ace_product_id,
-                            'position': img.position,
-                            'source_image_url': img.source_image_url,
-                            'is_uploaded': img.is_uploaded
-                        })
-
-                        stats['total_images'] += 1
-
-                    if result.status == "success":
+            # BATCH_SAVE_SIZE 상품씩 묶어 DELETE 1회 + INSERT 1회
+            for i in range(0, len(results), BATCH_SAVE_SIZE):
+                chunk = results[i:i + BATCH_SAVE_SIZE]
+                inserted, failed = replace_product_images(conn, chunk)
+                stats['total_images'] += inserted
+                failed_ids = {id(r) for r in failed}
+
+                for result in chunk:
+                    if id(result) in failed_ids:
+                        stats['error'] += 1
+                    elif result.status == "success":
                         stats['success'] += 1
                     elif result.status == "not_found":
                         stats['not_found'] += 1
                     else:
                         stats['error'] += 1
 
-                except Exception as e:
-                    log(f"DB 저장 오류 (ace_product_id={result.ace_product_id}): {e}", "ERROR")
-                    stats['error'] += 1
-
             conn.commit()
 
         log(f"DB 저장 완료: {stats['total_images']}개 이미지", "DB")
         return stats
 
-    def run(self, brand: str = None, model_no: str = None, limit: int = None, dry_run: bool = False, price_checked_only: bool = False, source_site: str = None) -> Dict:
+    def run(self, brand: str = None, model_no: str = None, limit: int = None, dry_run: bool = False, price_checked_only: bool = False, source_site: str = None,
+            use_search_cache: bool = True) -> Dict:
         """전체 실행"""
         log("=" * 60)
         log("W컨셉 이미지 수집 시작 (멀티프로세싱)")
@@ -613,12 +868,15 @@ class WconceptImageCollectorParallel:
         for idx, product in enumerate(products):
             product['_idx'] = idx
 
-        # 상품을 워커에 분배
-        chunks = [[] for _ in range(self.num_workers)]
-        for idx, product in enumerate(products):
-            chunks[idx % self.num_workers].append(product)
+        # 공용 작업 대기열 — 워커는 하나 끝날 때마다 다음 상품을 가져간다 (워커 수만큼 종료 표시 None)
+        num_workers = min(self.num_workers, total)
+        task_queue = mp.Queue()
+        for product in products:
+            task_queue.put(product)
+        for _ in range(num_workers):
+            task_queue.put(None)
 
-        log(f"상품 분배: {[len(c) for c in chunks]}")
+        log(f"작업 대기열: {total}개 상품 / 워커 {num_workers}개")
 
         start_time = time.time()
 
@@ -627,14 +885,14 @@ class WconceptImageCollectorParallel:
 
         # 워커 프로세스 시작
         processes = []
-        for worker_id, chunk in enumerate(chunks):
-            if chunk:
-                p = mp.Process(
-                    target=worker_process,
-                    args=(worker_id, chunk, total, self.headless, dry_run, result_queue)
-                )
-                p.start()
-                processes.append(p)
+        for worker_id in range(num_workers):
+            p = mp.Process(
+                target=worker_process,
+                args=(worker_id, task_queue, total, self.headless, dry_run, result_queue, use_search_cache,
+                      self.cdp_endpoint)
+            )
+            p.start()
+            processes.append(p)
 
         # 결과 수집 (각 워커의 통계)
         total_stats = {
@@ -656,6 +914,19 @@ class WconceptImageCollectorParallel:
         for p in processes:
             p.join()
 
+        # 워커가 일찍 끝난 경우(CDP 연결·브라우저 기동 실패 등) 대기열에 남은 상품을 비운다.
+        #   남겨 두면 종료 시 대기열 feeder 스레드를 기다리느라 부모 프로세스가 멈춘다.
+        left = 0
+        try:
+            while True:
+                if task_queue.get(timeout=0.1) is not None:
+                    left += 1
+        except queue.Empty:
+            pass
+        task_queue.cancel_join_thread()
+        if left:
+            log(f"워커가 먼저 종료되어 처리하지 못한 상품: {left}건", "WARNING")
+
         elapsed = time.time() - start_time
         log(f"\n수집 완료: {total}개 상품, 소요시간: {elapsed:.1f}초")
 
@@ -696,6 +967,8 @@ def main():
     parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help=f'동시 처리 워커 수 (기본 {DEFAULT_WORKERS})')
     parser.add_argument('--price-checked-only', action='store_true', help='최저가 확인된 상품만 이미지 수집')
     parser.add_argument('--source', type=str, default=None, help='특정 source_site만 처리 (예: okmall, kasina, nextzennpack)')
+    parser.add_argument('--no-search-cache', action='store_true', help='같은 모델번호 검색 결과·상품 이미지 재사용 안함')
+    parser.add_argument('--cdp-endpoint', type=str, default=None, help='이미 실행 중인 Chromium CDP 주소 (예: http://127.0.0.1:9222) — 워커들이 브라우저 하나를 공유')
 
     args = parser.parse_args()
     headless = args.headless.lower() != 'false'
@@ -704,7 +977,8 @@ def main():
         collector = WconceptImageCollectorParallel(
             DB_URL,
             headless=headless,
-            num_workers=args.workers
+            num_workers=args.workers,
+            cdp_endpoint=args.cdp_endpoint
         )
         stats = collector.run(
             brand=args.brand,
@@ -712,7 +986,8 @@ def main():
             limit=args.limit,
             dry_run=args.dry_run,
             price_checked_only=args.price_checked_only,
-            source_site=args.source
+            source_site=args.source,
+            use_search_cache=not args.no_search_cache
         )
 
         if stats.get('error', 0) > 0:
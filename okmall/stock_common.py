@@ -16,22 +16,34 @@
 2026-08-04 신설.
 """
 import os
+import importlib.util
 import json
+import queue
 import time
 import random
 import re
 import threading
 import unicodedata
 import urllib.parse
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from typing import Dict, List, Optional, Tuple
 
 import requests
 import pymysql
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from dotenv import load_dotenv
 
+try:
+    import orjson  # 있으면 API 로그 직렬화에 사용 (C 구현)
+except ImportError:
+    orjson = None
+
+try:
+    from selectolax.parser import HTMLParser as _SelectolaxParser  # 있으면 바이마 검색결과 파싱에 사용
+except ImportError:
+    _SelectolaxParser = None
+
 load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'), override=True)
 # =====================================================
 # 설정값
@@ -51,29 +63,74 @@ DEFAULT_SHIPPING_FEE = 15000
 BUYMA_BUYER_ID = os.getenv('BUYMA_BUYER_ID', '')  # 내 바이마 판매자 ID
 BUYMA_SEARCH_URL = "https://www.buyma.com/r/-O3/{model_no}/"
 _log_lock = threading.Lock()
+_ts_cache = [0, ""]  # [초 단위 epoch, 포맷된 문자열]
+# HTML 파서: lxml(C 구현)이 설치돼 있으면 그것을, 없으면 표준 html.parser
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+# 자주 쓰는 정규식/파서 필터는 모듈 로드 때 한 번만 만든다
+_PRICE_RE = re.compile(r'[\d,]+')
+_BUYER_ID_RE = re.compile(r'/buyer/(\d+)')
+_MODEL_PAREN_RE = re.compile(r'\s*\([^)]*\)')
+_MODEL_SEP_RE = re.compile(r'[-_/\\.,]+')
+_MODEL_NON_ALNUM_RE = re.compile(r'[^A-Za-z0-9]')
+
+
+def _has_product_class(value) -> bool:
+    """class 속성에 'product' 가 들어 있는지. 파싱 중에는 속성이 통째 문자열('product item')로 오므로 쪼개서 본다."""
+    if not value:
+        return False
+    return 'product' in (value.split() if isinstance(value, str) else value)
+
+
+# 검색결과 상품 카드만 파싱 — class_='product' 는 파싱 단계에서 속성 전체와 비교돼 다중 클래스 카드를 버린다
+_BUYMA_PRODUCT_STRAINER = SoupStrainer('li', class_=_has_product_class)
+
+DB_POOL_SIZE = 8  # 유휴 연결 보관 상한 (워커 + 상품별 서브 스레드 동시 사용분)
+LOWEST_PRICE_TTL_SEC = 600   # 바이마 최저가 조회 결과 재사용 시간 (같은 모델번호 재조회 생략)
+LOWEST_PRICE_CACHE_MAX = 50000
+RECONCILE_PUSH_WORKERS = 3   # reconcile push 동시 처리 그룹 수 (그룹마다 별도 DB 연결)
+RECONCILE_PUSH_PER_SEC = 2.5  # reconcile push 그룹 시작 속도 상한 (기존 0.4초 간격과 동일)
 
 # =====================================================
 # 공용 함수
 # =====================================================
 
+def _now_str() -> str:
+    """로그용 현재 시각 문자열. 초가 바뀔 때만 strftime 을 다시 한다 (같은 초 안에서는 재사용)."""
+    t = int(time.time())
+    cache = _ts_cache
+    if t != cache[0]:
+        cache[:] = [t, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))]
+    return cache[1]
+
+_rng_local = threading.local()
+
+def _thread_rng() -> random.Random:
+    """스레드별 난수 생성기. 워커들이 모듈 random 의 공유 상태를 같이 건드리지 않도록
+    스레드마다 처음 부를 때 하나 만들어 둔다."""
+    rng = getattr(_rng_local, 'rng', None)
+    if rng is None:
+        rng = _rng_local.rng = random.Random(os.urandom(8))
+    return rng
+
 def log(message: str, level: str = "INFO") -> None:
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] [{level}] {message}", flush=True)
+    print(f"[{_now_str()}] [{level}] {message}", flush=True)
 
 def log_batch(messages: List[str]) -> None:
     """여러 로그 메시지를 한 번에 출력 (병렬 처리 시 섞임 방지)"""
+    if not messages:
+        return
+    text = "\n".join(messages)  # 한 번에 써서 flush 도 한 번
     with _log_lock:
-        for msg in messages:
-            print(msg, flush=True)
+        print(text, flush=True)
 
 def parse_price(price_text: str) -> Optional[int]:
     if not price_text:
         return None
-    numbers = re.findall(r'[\d,]+', price_text)
-    if not numbers:
+    m = _PRICE_RE.search(price_text)  # 첫 숫자 덩어리만 쓰므로 findall 대신 search
+    if not m:
         return None
     try:
-        return int(numbers[0].replace(',', ''))
+        return int(m.group(0).replace(',', ''))
     except ValueError:
         return None
 
@@ -82,6 +139,38 @@ def decimal_to_float(obj):
         return float(obj)
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
+def _iter_buyma_cards(content: bytes):
+    """바이마 검색결과의 상품 카드(li.product)를 앞에서부터 (중고여부, 판매자 링크, 가격 문자열) 로 내준다.
+    selectolax 가 설치돼 있으면 그것으로(C 파서), 없으면 BeautifulSoup 으로 읽는다."""
+    if _SelectolaxParser is not None:
+        tree = _SelectolaxParser(content)
+        for node in tree.css('li.product'):
+            buyer = node.css_first('.product_Buyer a')
+            price = node.css_first('span.Price_Txt')
+            yield (node.css_first('span.product_used_tag') is not None,
+                   (buyer.attributes.get('href') or '') if buyer is not None else '',
+                   price.text(strip=True) if price is not None else None)
+        return
+
+    # 상품 카드 부분만 트리로 만든다 (헤더·추천영역 등은 건너뜀).
+    #   bytes 를 그대로 넘겨 인코딩 판별은 파서에 맡긴다. 카드는 find_next 로 하나씩 따라간다.
+    soup = BeautifulSoup(content, HTML_PARSER, parse_only=_BUYMA_PRODUCT_STRAINER)
+    node = soup.find('li', class_='product')
+    while node is not None:
+        buyer_box = node.find(class_='product_Buyer')
+        buyer = buyer_box.find('a') if buyer_box else None
+        price = node.find('span', class_='Price_Txt')
+        yield (node.find('span', class_='product_used_tag') is not None,
+               buyer.get('href', '') if buyer else '',
+               price.get_text(strip=True) if price else None)
+        node = node.find_next('li', class_='product')
+
+def dumps_json(obj, default=None) -> str:
+    """DB 에 넣을 JSON 문자열. orjson 이 있으면 그것으로, 없으면 표준 json (ensure_ascii=False)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, default=default)
+
 def _buyma_width(s: str) -> int:
     """바이마 반각 환산 길이 계산 (전각=2, 반각=1)"""
     w = 0
@@ -190,16 +279,16 @@ def generate_model_no_variants(model_no: str) -> List[str]:
     if not model_no:
         return []
 
-    model_no = re.sub(r'\s*\([^)]*\)', '', model_no).strip()
+    model_no = _MODEL_PAREN_RE.sub('', model_no).strip()
     variants = [model_no]  # 1. 원본
 
     # 2. 특수문자를 공백으로 바꾼 버전 (하이픈, 언더스코어 등)
-    space_replaced = re.sub(r'[-_/\\.,]+', ' ', model_no)
+    space_replaced = _MODEL_SEP_RE.sub(' ', model_no)
     if space_replaced != model_no and space_replaced not in variants:
         variants.append(space_replaced)
 
     # 3. 모든 특수문자와 공백을 제거한 버전
-    no_special = re.sub(r'[^A-Za-z0-9]', '', model_no)
+    no_special = _MODEL_NON_ALNUM_RE.sub('', model_no)
     if no_special and no_special not in variants:
         variants.append(no_special)
 
@@ -244,6 +333,80 @@ def calculate_margin(price_jpy: int, purchase_price_krw: float,
     }
 
 
+# =====================================================
+# DB 연결 풀
+# =====================================================
+
+class _PooledConnection:
+    """풀에서 빌린 pymysql 연결. close() 하면 끊지 않고 풀에 돌려준다.
+    그 외 cursor()/commit()/rollback() 등은 원래 연결에 그대로 넘긴다."""
+    def __init__(self, pool: 'ConnectionPool', conn: pymysql.Connection):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool.release(conn)
+
+
+class ConnectionPool:
+    """스레드 안전 pymysql 연결 풀 (표준 라이브러리만 사용).
+    매 호출 connect()/close() 하던 것을 재사용으로 바꿔 원격 DB 핸드셰이크를 없앤다.
+    빌릴 때 ping 으로 끊긴 연결은 되살리고, 보관 상한을 넘는 연결은 실제로 닫는다."""
+    def __init__(self, max_idle: int = DB_POOL_SIZE, **config):
+        self._config = config
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+
+    def connection(self) -> _PooledConnection:
+        try:
+            conn = self._idle.get_nowait()
+            conn.ping(reconnect=True)
+        except queue.Empty:
+            conn = pymysql.connect(**self._config)
+        except pymysql.MySQLError:
+            conn = pymysql.connect(**self._config)
+        return _PooledConnection(self, conn)
+
+    def release(self, conn: pymysql.Connection) -> None:
+        try:
+            conn.rollback()  # 커밋 안 된 작업은 다음 사용자에게 넘기지 않는다
+            self._idle.put_nowait(conn)
+        except (queue.Full, pymysql.MySQLError):
+            try:
+                conn.close()
+            except pymysql.MySQLError:
+                pass
+
+
+_db_pool = ConnectionPool(**DB_CONFIG)
+
+# 바이마 최저가 조회 결과 {검색어: (만료 시각, (가격, 오류))} — 프로세스 안에서 공유.
+#   가격을 찾았거나 "검색 결과 없음"/"경쟁자 없음"처럼 확정된 결과만 담는다 (타임아웃·요청 오류는 안 담음).
+_lowest_price_cache: Dict[str, Tuple[float, Tuple[Optional[int], Optional[str]]]] = {}
+_lowest_price_cache_lock = threading.Lock()
+
+
+class RateLimiter:
+    """전체 호출 속도를 per_sec 로 제한하는 스레드 안전 리미터(토큰 간격 방식)."""
+    def __init__(self, per_sec):
+        self.min_interval = 1.0 / per_sec
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            t = self._next if self._next > now else now
+            self._next = t + self.min_interval
+            sleep_for = t - now
+        if sleep_for > 0:
+            time.sleep(sleep_for)
+
+
 # =====================================================
 # 공용 메서드 (몰별 동기화 클래스가 상속)
 # =====================================================
@@ -252,10 +415,15 @@ class StockCommonMixin:
     """몰별 StockPriceSynchronizer 가 상속하는 공용 메서드 모음.
     본문은 각 몰 파일에 있던 것과 동일하다."""
     def get_connection(self) -> pymysql.Connection:
-        return pymysql.connect(**DB_CONFIG)
+        # 풀에서 빌려온다. 사용처의 conn.close() 는 그대로 두면 된다 (풀 반납).
+        return _db_pool.connection()
     def get_shipping_fee(self, category_id: int) -> int:
         if not category_id:
             return DEFAULT_SHIPPING_FEE
+        # 회차 캐시(prefetch_shipping_fees 가 채움)가 있으면 DB 안 간다
+        cache = getattr(self, '_shipping_fee_cache', None)
+        if cache is not None and category_id in cache:
+            return cache[category_id]
         conn = self.get_connection()
         try:
             with conn.cursor() as cursor:
@@ -265,13 +433,37 @@ class StockCommonMixin:
                     WHERE buyma_category_id = %s
                 """, (category_id,))
                 row = cursor.fetchone()
+                fee = DEFAULT_SHIPPING_FEE
                 if row and row.get('expected_shipping_fee'):
-                    return int(row['expected_shipping_fee'])
-                return DEFAULT_SHIPPING_FEE
+                    fee = int(row['expected_shipping_fee'])
+                if cache is not None:
+                    cache[category_id] = fee
+                return fee
         except:
             return DEFAULT_SHIPPING_FEE
         finally:
             conn.close()
+    def prefetch_shipping_fees(self, category_ids) -> None:
+        """이번 회차 상품들의 카테고리 배송비를 한 번에 읽어 self._shipping_fee_cache 에 채운다.
+        표에 없는 카테고리는 기본 배송비로 넣어 둔다 (get_shipping_fee 와 같은 결과)."""
+        ids = sorted({cid for cid in category_ids if cid})
+        cache = {cid: DEFAULT_SHIPPING_FEE for cid in ids}
+        if ids:
+            conn = self.get_connection()
+            try:
+                with conn.cursor() as cursor:
+                    fmt = ','.join(['%s'] * len(ids))
+                    cursor.execute(f"""
+                        SELECT buyma_category_id, expected_shipping_fee
+                        FROM buyma_master_categories_data
+                        WHERE buyma_category_id IN ({fmt})
+                    """, ids)
+                    for row in cursor.fetchall():
+                        if row.get('expected_shipping_fee'):
+                            cache[row['buyma_category_id']] = int(row['expected_shipping_fee'])
+            finally:
+                conn.close()
+        self._shipping_fee_cache = cache
     def get_buyma_lowest_price(self, model_no: str) -> Tuple[Optional[int], Optional[str]]:
         """
         바이마에서 경쟁자 최저가를 수집합니다.
@@ -282,41 +474,55 @@ class StockCommonMixin:
             return None, "모델번호 없음"
 
         encoded = urllib.parse.quote(model_no.replace('/', ' ').replace('#', ' ').replace('&', ' ').replace('?', ' ').strip(), safe='')
+
+        # 같은 검색어를 LOWEST_PRICE_TTL_SEC 안에 다시 조회하면 직전 결과를 그대로 쓴다
+        now = time.monotonic()
+        with _lowest_price_cache_lock:
+            hit = _lowest_price_cache.get(encoded)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+
+        result = self._fetch_buyma_lowest_price(encoded)
+        if result[0] is not None or result[1] in ("검색 결과 없음", "경쟁자 없음 (내 상품/중고만 존재)"):
+            with _lowest_price_cache_lock:
+                if len(_lowest_price_cache) >= LOWEST_PRICE_CACHE_MAX:
+                    _lowest_price_cache.clear()
+                _lowest_price_cache[encoded] = (now + LOWEST_PRICE_TTL_SEC, result)
+        return result
+
+    def _fetch_buyma_lowest_price(self, encoded: str) -> Tuple[Optional[int], Optional[str]]:
+        """바이마 검색 페이지를 실제로 요청해 경쟁자 최저가를 찾는다 (encoded: URL 인코딩된 검색어)"""
         url = BUYMA_SEARCH_URL.format(model_no=encoded)
 
         try:
             response = self.buyma_session.get(url, timeout=30)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            products = soup.find_all('li', class_='product')
-            if not products:
-                return None, "검색 결과 없음"
-
-            # 모든 상품을 순회하며 경쟁자(내 상품 제외, 중고 제외) 최저가 찾기
-            for product in products:
+            # 상품 카드를 앞에서부터 하나씩 따라가며 경쟁자(내 상품 제외, 중고 제외) 최저가 찾기.
+            #   첫 경쟁자 가격을 찾으면 거기서 끝낸다.
+            seen = False
+            for is_used, buyer_href, price_text in _iter_buyma_cards(response.content):
+                seen = True
                 # 1. 중고 상품 제외
-                used_tag = product.find('span', class_='product_used_tag')
-                if used_tag:
+                if is_used:
                     continue
 
                 # 2. 내 상품 제외
-                buyer_elem = product.select_one('.product_Buyer a')
-                if buyer_elem:
-                    href = buyer_elem.get('href', '')
-                    buyer_match = re.search(r'/buyer/(\d+)', href)
+                if buyer_href:
+                    buyer_match = _BUYER_ID_RE.search(buyer_href)
                     if buyer_match:
                         buyer_id = buyer_match.group(1)
                         if BUYMA_BUYER_ID and buyer_id == BUYMA_BUYER_ID:
                             continue
 
                 # 3. 가격 추출 (경쟁자 상품)
-                price_elem = product.find('span', class_='Price_Txt')
-                if price_elem:
-                    price = parse_price(price_elem.get_text(strip=True))
+                if price_text:
+                    price = parse_price(price_text)
                     if price:
                         return price, None
 
+            if not seen:
+                return None, "검색 결과 없음"
+
             # 내 상품만 있거나 가격 추출 실패
             return None, "경쟁자 없음 (내 상품/중고만 존재)"
 
@@ -338,6 +544,30 @@ class StockCommonMixin:
                 return cursor.fetchall()
         finally:
             conn.close()
+    def get_variants_bulk(self, ace_product_ids: List[int], chunk_size: int = 1000) -> Dict[int, List[Dict]]:
+        """여러 상품의 옵션을 IN 조회로 한꺼번에 읽어 {ace_product_id: [옵션...]} 로 돌려준다.
+        행 모양은 get_current_variants 와 같다. 옵션이 없는 상품도 빈 리스트로 들어 있다."""
+        by_product = {pid: [] for pid in ace_product_ids}
+        if not by_product:
+            return by_product
+        ids = list(by_product)
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                for i in range(0, len(ids), chunk_size):
+                    chunk = ids[i:i + chunk_size]
+                    fmt = ','.join(['%s'] * len(chunk))
+                    cursor.execute(f"""
+                        SELECT ace_product_id, id, color_value, size_value, color_value_original,
+                               size_value_original, source_option_code, stock_type
+                        FROM ace_product_variants
+                        WHERE ace_product_id IN ({fmt})
+                    """, chunk)
+                    for row in cursor.fetchall():
+                        by_product[row.pop('ace_product_id')].append(row)
+            return by_product
+        finally:
+            conn.close()
     def update_ace_products_price(self, ace_product_id: int, original_price_krw: int,
                                    purchase_price_krw: int, price_jpy: int,
                                    original_price_jpy: int, buyma_lowest_price: int,
@@ -367,19 +597,61 @@ class StockCommonMixin:
                 conn.commit()
         finally:
             conn.close()
+    def update_ace_products_price_bulk(self, rows: List[Dict], chunk_size: int = 200) -> None:
+        """
+        update_ace_products_price 여러 건을 묶어서 반영.
+        rows: [{'id', 'original_price_krw', 'purchase_price_krw', 'price', 'original_price_jpy',
+                'buyma_lowest_price', 'margin_rate', 'margin_amount_krw', 'is_lowest_price',
+                'purchase_price_jpy'}, ...]
+        값 목록을 UNION ALL 파생 테이블로 만들어 UPDATE ... JOIN 한 번에 chunk_size 건씩 처리한다.
+        """
+        if not rows:
+            return
+        cols = ('original_price_krw', 'purchase_price_krw', 'price', 'original_price_jpy',
+                'buyma_lowest_price', 'margin_rate', 'margin_amount_krw', 'is_lowest_price',
+                'purchase_price_jpy')
+        first = 'SELECT %s AS id, ' + ', '.join(f'%s AS {c}' for c in cols)
+        rest = 'SELECT ' + ', '.join(['%s'] * (len(cols) + 1))
+        sets = ',\n                            '.join(f'p.{c} = v.{c}' for c in cols)
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                for i in range(0, len(rows), chunk_size):
+                    chunk = rows[i:i + chunk_size]
+                    derived = '\n                        UNION ALL '.join([first] + [rest] * (len(chunk) - 1))
+                    params = [v for r in chunk for v in (r['id'], *(r.get(c) for c in cols))]
+                    cursor.execute(f"""
+                        UPDATE ace_products p
+                        JOIN ({derived}) v ON p.id = v.id
+                        SET {sets},
+                            p.margin_calculated_at = NOW(),
+                            p.buyma_lowest_price_checked_at = NOW()
+                    """, params)
+                conn.commit()
+        finally:
+            conn.close()
     def update_ace_variants_stock(self, stock_changes: List[Dict]) -> None:
         if not stock_changes:
             return
         conn = self.get_connection()
         try:
+            # 바뀔 상태값별로 묶어 상태마다 UPDATE ... WHERE id IN (...) 한 번씩.
+            #   (pymysql executemany 는 UPDATE 를 건마다 따로 보낸다 → 상태 수만큼만 왕복)
+            ids_by_status = {}
+            for change in stock_changes:
+                ids_by_status.setdefault(change['new_status'], []).append(change['variant_id'])
             with conn.cursor() as cursor:
-                for change in stock_changes:
-                    cursor.execute("""
-                        UPDATE ace_product_variants
-                        SET stock_type = %s,
-                            source_stock_status = %s
-                        WHERE id = %s
-                    """, (change['new_status'], change['new_status'], change['variant_id']))
+                for new_status, variant_ids in ids_by_status.items():
+                    # 여러 상품 것을 모아 넘기는 경우가 있어 IN 목록은 1000개씩 자른다
+                    for i in range(0, len(variant_ids), 1000):
+                        chunk = variant_ids[i:i + 1000]
+                        fmt = ','.join(['%s'] * len(chunk))
+                        cursor.execute(f"""
+                            UPDATE ace_product_variants
+                            SET stock_type = %s,
+                                source_stock_status = %s
+                            WHERE id IN ({fmt})
+                        """, [new_status, new_status, *chunk])
                 conn.commit()
         finally:
             conn.close()
@@ -396,8 +668,29 @@ class StockCommonMixin:
                 conn.commit()
         finally:
             conn.close()
+    def update_sync_time_bulk(self, ace_product_ids: List[int], chunk_size: int = 1000) -> None:
+        """update_sync_time_only 여러 건을 WHERE id IN (...) 한 번으로"""
+        if not ace_product_ids:
+            return
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cursor:
+                for i in range(0, len(ace_product_ids), chunk_size):
+                    chunk = ace_product_ids[i:i + chunk_size]
+                    fmt = ','.join(['%s'] * len(chunk))
+                    cursor.execute(f"""
+                        UPDATE ace_products
+                        SET buyma_lowest_price_checked_at = NOW()
+                        WHERE id IN ({fmt})
+                    """, chunk)
+                conn.commit()
+        finally:
+            conn.close()
     def update_product_after_api_call(self, ace_product_id: int, request_data: Dict, response: Dict) -> None:
         """API 요청 후 상품 상태 업데이트 (buyma_product_register.py와 동일)"""
+        # 직렬화는 연결을 잡기 전에 끝낸다 (트랜잭션을 그만큼 짧게)
+        request_json = dumps_json(request_data, default=decimal_to_float)
+        response_json = dumps_json(response)
         conn = self.get_connection()
         try:
             with conn.cursor() as cursor:
@@ -415,11 +708,7 @@ class StockCommonMixin:
                     INSERT INTO ace_product_api_logs (ace_product_id, api_request_json, api_response_json, last_api_call_at)
                     VALUES (%s, %s, %s, NOW())
                     ON DUPLICATE KEY UPDATE api_request_json = VALUES(api_request_json), api_response_json = VALUES(api_response_json), last_api_call_at = NOW()
-                """, (
-                    ace_product_id,
-                    json.dumps(request_data, ensure_ascii=False, default=decimal_to_float),
-                    json.dumps(response, ensure_ascii=False)
-                ))
+                """, (ace_product_id, request_json, response_json))
                 conn.commit()
         finally:
             conn.close()
@@ -460,28 +749,70 @@ class StockCommonMixin:
                             model_nos)
                 rows = cur.fetchall()
             seen, groups = set(), []
+            buckets: Dict[str, List] = {}
             for r in rows:
-                key = (r['brand_id'], canonicalize(r['model_no']))
+                canon = canonicalize(r['model_no'])
+                key = (r['brand_id'], canon)
                 if key in seen:
                     continue
                 seen.add(key)
                 groups.append((r['model_no'], r['brand_id']))
+                buckets.setdefault(canon, []).append((len(groups), r['model_no'], r['brand_id']))
             log(f"[MERGE] reconcile push 대상(이번 refresh 그룹): {len(groups)}건")
-            ok = err = skip = 0
-            # 로그용 몰이름 — 이미 조회된 products 에서 꺼냄(추가 쿼리·JOIN 없음).
-            _mall = (products[0].get('source_site') or '?') if products else '?'
-            _total = len(groups)
-            for _i, (model_no, brand_id) in enumerate(groups, 1):
-                res = rr.process_one_group(conn, model_no, brand_id, dry_run=False, scope='published',
-                                           tag=f"[{_mall} {_i}/{_total}] ")
-                resp = res.get('response') or {}
-                if res.get('skipped'):
-                    skip += 1
-                elif resp.get('success'):
-                    ok += 1
-                elif resp:
-                    err += 1
-                time.sleep(0.4)
-            log(f"[MERGE] reconcile 완료: 성공 {ok} / 실패 {err} / 스킵 {skip}")
         finally:
             conn.close()
+
+        # 그룹락은 canon 단위(brand_id 무관)라, 같은 canon 의 그룹을 동시에 돌리면 서로 락을 기다리다
+        #   늦은 쪽이 '다른 PC 처리중'으로 스킵된다. → canon 묶음(buckets) 하나를 한 작업에서 차례로 처리하고,
+        #   서로 다른 canon 묶음끼리만 RECONCILE_PUSH_WORKERS 개씩 동시에 push.
+        #   스레드마다 DB 연결을 하나씩 두고, 시작 속도는 리미터로 기존 0.4초 간격에 맞춘다.
+        # 로그용 몰이름 — 이미 조회된 products 에서 꺼냄(추가 쿼리·JOIN 없음).
+        _mall = (products[0].get('source_site') or '?') if products else '?'
+        _total = len(groups)
+        limiter = RateLimiter(RECONCILE_PUSH_PER_SEC)
+        tls = threading.local()
+        thread_conns = []
+        conns_lock = threading.Lock()
+
+        def _push_bucket(bucket):
+            """같은 canon 그룹들을 차례로 push. 그룹마다 결과 또는 예외를 담아 돌려준다."""
+            gconn = getattr(tls, 'conn', None)
+            if gconn is None:
+                gconn = tls.conn = push.get_connection()
+                with conns_lock:
+                    thread_conns.append(gconn)
+            results = []
+            for i, model_no, brand_id in bucket:
+                limiter.acquire()
+                try:
+                    results.append(rr.process_one_group(gconn, model_no, brand_id, dry_run=False,
+                                                        scope='published', tag=f"[{_mall} {i}/{_total}] "))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+        ok = err = skip = 0
+        try:
+            with ThreadPoolExecutor(max_workers=RECONCILE_PUSH_WORKERS,
+                                    thread_name_prefix='reconcile-push') as ex:
+                futures = [ex.submit(_push_bucket, b) for b in buckets.values()]
+                for f in futures:
+                    for res in f.result():
+                        if isinstance(res, Exception):
+                            log(f"[MERGE] reconcile 그룹 오류: {res}", "ERROR")
+                            err += 1
+                            continue
+                        resp = res.get('response') or {}
+                        if res.get('skipped'):
+                            skip += 1
+                        elif resp.get('success'):
+                            ok += 1
+                        elif resp:
+                            err += 1
+        finally:
+            for c in thread_conns:
+                try:
+                    c.close()
+                except Exception:
+                    pass
+        log(f"[MERGE] reconcile 완료: 성공 {ok} / 실패 {err} / 스킵 {skip}")
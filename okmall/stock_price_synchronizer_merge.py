@@ -43,18 +43,18 @@ import sys
 import io
 import json
 import time
-import random
-import re
 import argparse
 import urllib.parse
-from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from decimal import Decimal
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import threading
+from collections import defaultdict
 
 import unicodedata
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import pymysql
 from dotenv import load_dotenv
@@ -68,8 +68,8 @@ import authority_flag
 # [공용] 재고동기화 공용 부품 — 상수·함수·메서드는 okmall/stock_common.py 한 곳에 있다.
 from stock_common import (  # noqa: E402
     DB_CONFIG, EXCHANGE_RATE, SALES_FEE_RATE, DEFAULT_SHIPPING_FEE,
-    BUYMA_BUYER_ID, BUYMA_SEARCH_URL, _log_lock,
-    log, log_batch, parse_price, decimal_to_float, _buyma_width,
+    BUYMA_BUYER_ID, BUYMA_SEARCH_URL, HTML_PARSER, _log_lock,
+    log, log_batch, _now_str, _thread_rng, parse_price, decimal_to_float, _buyma_width,
     truncate_buyma_name, truncate_option_value, truncate_buying_shop_name,
     generate_model_no_variants, calculate_margin,
     StockCommonMixin,
@@ -204,12 +204,31 @@ API_CALL_DELAY = 0.2     # 바이마 API 호출 후 딜레이
 
 # 병렬 처리 설정
 MAX_WORKERS = 2  # 동시 처리 스레드 수 (차단 방지를 위해 1개 권장)
+# 바이마 최저가 선조회 스레드 수. 대기열(MAX_WORKERS*2)보다 작게 둬서 뒤쪽 상품 조회는 큐에서 기다리게 한다
+#   → 오케이몰 수집이 실패/차단되면 아직 시작 안 한 조회는 cancel() 로 실제로 취소된다.
+BUYMA_LOOKUP_WORKERS = MAX_WORKERS
+DB_FLUSH_SIZE = 200  # ace_products 가격/체크시간 갱신을 이만큼 모아서 한 번에 반영
 
 # 세션 관리 설정
 SESSION_REFRESH_INTERVAL = 30  # 30개마다 세션 교체 + 메인 페이지 방문
 MAX_CONSECUTIVE_TIMEOUTS = 5   # 연속 타임아웃 5회 시 차단으로 판단
 FETCH_MAX_RETRIES = 2          # 상품 페이지 요청 실패 시 재시도 횟수 (총 3회 시도)
 
+# 오케이몰 사이즈 표기 중 FREE 로 바꾸는 값 (raw_to_ace_converter.py와 동일)
+FREE_SIZE_LABELS = frozenset(['단일사이즈', '단일 사이즈', '단일', '원사이즈', '원 사이즈'])
+
+
+class _DigitsOnly(dict):
+    """str.translate 용 표: 0-9 만 남기고 나머지 글자는 지운다.
+    처음 본 글자만 __missing__ 으로 채워 두고 이후엔 C 수준 조회로 끝난다."""
+    def __missing__(self, code):
+        keep = code if 48 <= code <= 57 else None
+        self[code] = keep
+        return keep
+
+
+_DIGITS_ONLY = _DigitsOnly()
+
 # 마진 계산 상수 (buyma_product_register.py와 동일)
 
 
@@ -268,8 +287,7 @@ def filter_details_by_category(details: List[Dict], category_id: int) -> List[Di
 
 
 def random_delay() -> None:
-    delay = random.uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX)
-    time.sleep(delay)
+    time.sleep(_thread_rng().uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX))
 
 
 # =====================================================
@@ -286,6 +304,15 @@ class StockPriceSynchronizer(StockCommonMixin):
     def __init__(self):
         self.buyma_session = requests.Session()
         self.buyma_session.headers.update(BUYMA_HEADERS)
+        # 최저가 선조회 스레드가 연결을 버리지 않고 재사용하도록 풀 크기를 맞춘다.
+        #   바이마 쪽 일시 오류(502/503/504)는 같은 연결 풀에서 짧게 재시도한다.
+        _adapter = HTTPAdapter(pool_connections=BUYMA_LOOKUP_WORKERS, pool_maxsize=BUYMA_LOOKUP_WORKERS,
+                               max_retries=Retry(total=2, backoff_factor=0.3,
+                                                 status_forcelist=(502, 503, 504),
+                                                 allowed_methods=frozenset({'GET'}),
+                                                 raise_on_status=False))
+        self.buyma_session.mount('https://', _adapter)
+        self.buyma_session.mount('http://', _adapter)
         
         # 403 차단 플래그 (스레드 간 공유)
         self.is_blocked = False
@@ -293,6 +320,21 @@ class StockPriceSynchronizer(StockCommonMixin):
         self._new_variant_ids = []
         self.gone_detect_only = False
         self.block_lock = threading.Lock()
+        # 집계는 스레드마다 따로 세고 run 끝에 한 번 합친다 (증가마다 락 잡지 않음)
+        self._tls = threading.local()
+        self._all_local_stats = []
+        self._stats_registry_lock = threading.Lock()
+        # run 시작 때 한 번에 읽어 둔 옵션 {ace_product_id: [옵션...]} (상품별 조회 대신)
+        self._variants_by_product = {}
+        # 바이마 최저가 조회 전용 풀 (run 동안만 존재. 없으면 호출 스레드에서 직접 조회)
+        self._lookup_executor = None
+        # 대기열에 넣을 때 미리 띄운 최저가 조회 {ace_product_id: Future}
+        self._lowest_futures = {}
+        # 모아 뒀다가 DB_FLUSH_SIZE 마다 / run 끝에 한 번에 쓰는 ace_products 갱신
+        self._pending_price_rows = []
+        self._pending_touch_ids = []
+        self._pending_variant_changes = []
+        self._pending_lock = threading.Lock()
         
         # ★★★ 오케이몰 세션 관리 (v2 추가) ★★★
         self.okmall_session = None           # 현재 오케이몰 세션
@@ -321,7 +363,7 @@ class StockPriceSynchronizer(StockCommonMixin):
             self.okmall_session = requests.Session()
             
             # 랜덤 브라우저 프로필 선택
-            self.okmall_profile = random.choice(BROWSER_PROFILES).copy()
+            self.okmall_profile = _thread_rng().choice(BROWSER_PROFILES).copy()
             
             # 메인 페이지 방문 헤더 설정
             main_headers = self.okmall_profile.copy()
@@ -347,7 +389,7 @@ class StockPriceSynchronizer(StockCommonMixin):
             self.okmall_request_count = 0
             
             # 짧은 대기 (사람처럼)
-            time.sleep(random.uniform(0.5, 1.5))
+            time.sleep(_thread_rng().uniform(0.5, 1.5))
             
             log(f"  [세션] 새 세션 준비 완료 (쿠키 획득됨)")
             return True, None
@@ -485,13 +527,14 @@ class StockPriceSynchronizer(StockCommonMixin):
         if not html:
             return {}, "일시적 오류 (스킵): 빈 응답"
 
+        # 흠집 상품 체크 (상세 페이지에서는 scratch-banner 클래스로 표시됨)
+        #   문자열 검사라 파싱 전에 한다 → 흠집 상품은 DOM 을 아예 만들지 않는다.
+        if 'scratch-banner' in html:
+            return {}, "흠집 상품"
+
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # 흠집 상품 체크 (상세 페이지에서는 scratch-banner 클래스로 표시됨)
-            if 'scratch-banner' in html:
-                return {}, "흠집 상품"
-            
+            soup = BeautifulSoup(html, HTML_PARSER)
+
             # options_complete: 옵션 목록을 몰이 배열로 통째로 준 경우에만 True.
             #   True 여야만 '몰 목록에 없는 옵션 = 판매자가 내림' 으로 판정할 수 있다.
             #   아래 단일상품 fallback 으로 만들어낸 목록은 진짜 목록이 아니므로 False 유지.
@@ -501,30 +544,39 @@ class StockPriceSynchronizer(StockCommonMixin):
             origin_elem = soup.select_one('.value_price .price')
             if origin_elem:
                 price_text = origin_elem.get_text()
-                price_match = re.sub(r'[^0-9]', '', price_text)
+                price_match = price_text.translate(_DIGITS_ONLY)
                 if price_match:
                     result['original_price'] = int(price_match)
 
-            # 판매가 (JSON-LD)
-            scripts = soup.find_all('script', type='application/ld+json')
-            for script in scripts:
+            # JSON-LD 는 여기서 한 번만 읽어 Product 블록만 모아 둔다 (판매가·재고보완·단일상품 공용)
+            ld_products = []
+            for script in soup.find_all('script', type='application/ld+json'):
                 if script.string:
                     try:
                         ld_data = json.loads(script.string)
-                        if ld_data.get('@type') == 'Product':
-                            offers = ld_data.get('offers', {})
-                            if offers.get('@type') == 'AggregateOffer':
-                                result['sale_price'] = int(offers.get('lowPrice') or 0)
-                            else:
-                                result['sale_price'] = int(offers.get('price') or 0)
-                            break
-                    except (json.JSONDecodeError, ValueError):
-                        pass
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(ld_data, dict) and ld_data.get('@type') == 'Product':
+                        ld_products.append(ld_data)
+
+            # 판매가 (JSON-LD 첫 Product)
+            if ld_products:
+                offers = ld_products[0].get('offers', {})
+                try:
+                    if offers.get('@type') == 'AggregateOffer':
+                        result['sale_price'] = int(offers.get('lowPrice') or 0)
+                    else:
+                        result['sale_price'] = int(offers.get('price') or 0)
+                except ValueError:
+                    pass
 
             # 옵션별 재고 (raw_to_ace_converter.py 로직 참고)
-            opt_rows = soup.select('#ProductOPTList tbody tr[name="selectOption"]')
+            #   옵션 표를 먼저 한 번 찾고 그 안에서만 행을 고른다 (문서 전체 CSS 매칭 회피)
+            #   행/칸 탐색은 CSS 선택기(soupsieve) 대신 find_all 로 직접 한다.
+            opt_table = soup.find(id='ProductOPTList')
+            opt_rows = opt_table.find_all('tr', attrs={'name': 'selectOption'}) if opt_table else []
             for row in opt_rows:
-                cols = row.select('td')
+                cols = row.find_all('td')
                 if len(cols) >= 3:
                     sinfo = row.get('sinfo', '')
                     option_code = sinfo.split('|')[-1] if sinfo else ''
@@ -534,12 +586,12 @@ class StockPriceSynchronizer(StockCommonMixin):
 
                     # size_notice 태그 제거 후 사이즈 추출 (품절 임박 제외)
                     size_elem = cols[1]
-                    for notice in size_elem.select('.size_notice'):
+                    for notice in size_elem.find_all(class_='size_notice'):
                         notice.decompose()
                     size_raw = size_elem.get_text(strip=True)
 
                     # 사이즈: 단일사이즈 → FREE 변환 (raw_to_ace_converter.py와 동일)
-                    if size_raw in ['단일사이즈', '단일 사이즈', '단일', '원사이즈', '원 사이즈']:
+                    if size_raw in FREE_SIZE_LABELS:
                         size = 'FREE'
                     else:
                         size = size_raw
@@ -551,27 +603,25 @@ class StockPriceSynchronizer(StockCommonMixin):
                         'status': 'in_stock'
                     }
                     # 품절 임박이 아닌 실제 품절만 확인
-                    row_text = row.get_text()
-                    if '품절' in row_text and '품절 임박' not in row_text:
-                        option['status'] = 'out_of_stock'
+                    #   대부분의 행엔 '품절' 글자가 아예 없다 → 텍스트 조각만 훑고 끝낸다.
+                    #   있을 때만 행 전체 문자열을 만들어 기존과 같이 '품절 임박' 여부를 본다.
+                    if any('품절' in t for t in row.strings):
+                        row_text = row.get_text()
+                        if '품절' in row_text and '품절 임박' not in row_text:
+                            option['status'] = 'out_of_stock'
                     result['options'].append(option)
 
             # JSON-LD로 재고 상태 보완
-            for script in scripts:
-                if script.string:
-                    try:
-                        ld_data = json.loads(script.string)
-                        if ld_data.get('@type') == 'Product':
-                            offers = ld_data.get('offers', {})
-                            if offers.get('@type') == 'AggregateOffer':
-                                for offer in offers.get('offers', []):
-                                    sku = str(offer.get('sku', ''))
-                                    is_out = 'OutOfStock' in offer.get('availability', '')
-                                    for opt in result['options']:
-                                        if opt.get('option_code') == sku:
-                                            opt['status'] = 'out_of_stock' if is_out else 'in_stock'
-                    except json.JSONDecodeError:
-                        pass
+            #   sku → 품절여부 표를 먼저 만들고 옵션을 한 번만 훑는다 (옵션×offer 이중 루프 제거)
+            for ld_data in ld_products:
+                offers = ld_data.get('offers', {})
+                if offers.get('@type') == 'AggregateOffer':
+                    sku_out = {str(offer.get('sku', '')): 'OutOfStock' in offer.get('availability', '')
+                               for offer in offers.get('offers', [])}
+                    for opt in result['options']:
+                        is_out = sku_out.get(opt.get('option_code'))
+                        if is_out is not None:
+                            opt['status'] = 'out_of_stock' if is_out else 'in_stock'
 
             # 단일 상품 또는 일시품절 (옵션 테이블이 없는 경우)
             # ★ 여기까지 왔으면 목록은 몰이 준 배열을 통째로 훑은 결과다.
@@ -580,50 +630,43 @@ class StockPriceSynchronizer(StockCommonMixin):
             if result['options']:
                 result['options_complete'] = True
 
-            if not result['options']:
-                for script in scripts:
-                    if script.string:
-                        try:
-                            ld_data = json.loads(script.string)
-                            if ld_data.get('@type') == 'Product':
-                                offers = ld_data.get('offers', {})
-                                if offers.get('@type') == 'AggregateOffer':
-                                    offer_list = offers.get('offers', [])
-                                    # 일시품절: 옵션 테이블이 없어도 offer별 sku+availability를 보존해야
-                                    # source_option_code로 DB variants와 매칭 가능.
-                                    # (ONE SIZE로 뭉개면 다중옵션 상품 매칭 실패 → 품절 미감지 → 바이마 미삭제)
-                                    sku_added = False
-                                    for o in offer_list:
-                                        sku = str(o.get('sku', '') or '').strip()
-                                        if not sku:
-                                            continue
-                                        is_out = 'OutOfStock' in o.get('availability', '')
-                                        result['options'].append({
-                                            'color': '', 'size': '',
-                                            'option_code': sku,
-                                            'status': 'out_of_stock' if is_out else 'in_stock'
-                                        })
-                                        sku_added = True
-                                    if not sku_added:
-                                        # sku 없는 AggregateOffer → 기존처럼 전체 단일 판정
-                                        if offer_list and all('OutOfStock' in o.get('availability', '') for o in offer_list):
-                                            status = 'out_of_stock'
-                                        else:
-                                            status = 'in_stock'
-                                        result['options'].append({
-                                            'color': '', 'size': 'ONE SIZE',
-                                            'option_code': '', 'status': status
-                                        })
-                                else:
-                                    availability = offers.get('availability', '')
-                                    status = 'out_of_stock' if 'OutOfStock' in availability else 'in_stock'
-                                    result['options'].append({
-                                        'color': '', 'size': 'ONE SIZE',
-                                        'option_code': '', 'status': status
-                                    })
-                                break
-                        except json.JSONDecodeError:
-                            pass
+            if not result['options'] and ld_products:
+                ld_data = ld_products[0]
+                offers = ld_data.get('offers', {})
+                if offers.get('@type') == 'AggregateOffer':
+                    offer_list = offers.get('offers', [])
+                    # 일시품절: 옵션 테이블이 없어도 offer별 sku+availability를 보존해야
+                    # source_option_code로 DB variants와 매칭 가능.
+                    # (ONE SIZE로 뭉개면 다중옵션 상품 매칭 실패 → 품절 미감지 → 바이마 미삭제)
+                    sku_added = False
+                    for o in offer_list:
+                        sku = str(o.get('sku', '') or '').strip()
+                        if not sku:
+                            continue
+                        is_out = 'OutOfStock' in o.get('availability', '')
+                        result['options'].append({
+                            'color': '', 'size': '',
+                            'option_code': sku,
+                            'status': 'out_of_stock' if is_out else 'in_stock'
+                        })
+                        sku_added = True
+                    if not sku_added:
+                        # sku 없는 AggregateOffer → 기존처럼 전체 단일 판정
+                        if offer_list and all('OutOfStock' in o.get('availability', '') for o in offer_list):
+                            status = 'out_of_stock'
+                        else:
+                            status = 'in_stock'
+                        result['options'].append({
+                            'color': '', 'size': 'ONE SIZE',
+                            'option_code': '', 'status': status
+                        })
+                else:
+                    availability = offers.get('availability', '')
+                    status = 'out_of_stock' if 'OutOfStock' in availability else 'in_stock'
+                    result['options'].append({
+                        'color': '', 'size': 'ONE SIZE',
+                        'option_code': '', 'status': status
+                    })
 
             return result, None
 
@@ -931,8 +974,98 @@ class StockPriceSynchronizer(StockCommonMixin):
     # -------------------------------------------------
     # 단일 상품 처리 (병렬 처리용)
     # -------------------------------------------------
-    def process_single_product(self, product: Dict, idx: int, total: int, dry_run: bool, force: bool,
-                                stats: Dict, stats_lock: threading.Lock) -> None:
+    def _local_stats(self) -> Dict:
+        """현재 스레드 전용 집계 dict. 스레드당 처음 한 번만 레지스트리에 등록(이때만 락)."""
+        stats = getattr(self._tls, 'stats', None)
+        if stats is None:
+            stats = self._tls.stats = defaultdict(int)
+            with self._stats_registry_lock:
+                self._all_local_stats.append(stats)
+        return stats
+
+    def _merge_local_stats(self, stats: Dict) -> None:
+        """스레드별 집계를 stats 에 합친다 (숫자는 더하고, 목록은 이어 붙인다)"""
+        for local in self._all_local_stats:
+            for k, v in local.items():
+                if isinstance(v, list):
+                    stats.setdefault(k, []).extend(v)
+                else:
+                    stats[k] = stats.get(k, 0) + v
+
+    def _pop_prefetched_variants(self, ace_product_id: int) -> List[Dict]:
+        """run 시작 때 미리 읽어 둔 옵션을 꺼낸다. 없으면(단독 호출 등) 그때 조회."""
+        db_variants = self._variants_by_product.pop(ace_product_id, None)
+        if db_variants is None:
+            db_variants = self.get_current_variants(ace_product_id)
+        return db_variants
+
+    def _flush_pending(self, attr: str, write, label: str) -> bool:
+        """
+        self.<attr> 에 모아 둔 항목을 write(items) 로 반영.
+        실패하면 꺼낸 항목을 목록 앞에 되돌려 두고 False (다음 반영 때 다시 시도, 유실 없음).
+        """
+        with self._pending_lock:
+            items = getattr(self, attr)
+            if not items:
+                return True
+            setattr(self, attr, [])
+        try:
+            write(items)
+            return True
+        except Exception as e:
+            with self._pending_lock:
+                getattr(self, attr)[:0] = items
+            log(f"{label} 일괄 반영 실패 ({len(items)}건 보류, 다음 반영 때 재시도): {e}", "ERROR")
+            return False
+
+    def _queue_price_update(self, row: Dict) -> None:
+        """update_ace_products_price 대신 모아 둔다 (row 키는 update_ace_products_price_bulk 참고)"""
+        with self._pending_lock:
+            self._pending_price_rows.append(row)
+            if len(self._pending_price_rows) < DB_FLUSH_SIZE:
+                return
+        self._flush_pending('_pending_price_rows', self.update_ace_products_price_bulk, "가격")
+
+    def _queue_sync_touch(self, ace_product_id: int) -> None:
+        """update_sync_time_only 대신 모아 둔다"""
+        with self._pending_lock:
+            self._pending_touch_ids.append(ace_product_id)
+            if len(self._pending_touch_ids) < DB_FLUSH_SIZE:
+                return
+        self._flush_pending('_pending_touch_ids', self.update_sync_time_bulk, "체크시간")
+
+    def _queue_variant_changes(self, stock_changes: List[Dict]) -> None:
+        """update_ace_variants_stock 을 상품마다 부르지 않고 여러 상품 것을 모아 둔다"""
+        with self._pending_lock:
+            self._pending_variant_changes.extend(stock_changes)
+            if len(self._pending_variant_changes) < DB_FLUSH_SIZE:
+                return
+        self._flush_pending('_pending_variant_changes', self.update_ace_variants_stock, "옵션 재고")
+
+    def _flush_pending_updates(self) -> bool:
+        """
+        모아 둔 ace_products / 옵션 재고 갱신을 모두 반영 (reconcile 전에 반드시 호출).
+        목록마다 따로 시도 — 하나가 실패해도 나머지는 반영. 하나라도 못 쓰면 False.
+        """
+        ok = self._flush_pending('_pending_price_rows', self.update_ace_products_price_bulk, "가격")
+        ok = self._flush_pending('_pending_touch_ids', self.update_sync_time_bulk, "체크시간") and ok
+        ok = self._flush_pending('_pending_variant_changes', self.update_ace_variants_stock, "옵션 재고") and ok
+        return ok
+
+    def _pending_count(self) -> int:
+        """아직 DB 에 못 쓴 보류 항목 수"""
+        with self._pending_lock:
+            return (len(self._pending_price_rows) + len(self._pending_touch_ids)
+                    + len(self._pending_variant_changes))
+
+    def _prefetch_lowest_price(self, product: Dict) -> None:
+        """상품을 대기열에 넣는 시점에 바이마 최저가 조회를 미리 띄운다 (--gone-detect-only 제외)."""
+        lookup = self._lookup_executor
+        if lookup is None or self.gone_detect_only:
+            return
+        self._lowest_futures[product['id']] = lookup.submit(self.get_buyma_lowest_price, product.get('model_no'))
+
+    def process_single_product(self, product: Dict, idx: int, total: int, dry_run: bool, force: bool) -> None:
         """단일 상품 동기화 처리 (스레드에서 실행) - 로그를 모아서 한 번에 출력"""
         
         # ★ 차단 상태 확인 (다른 스레드에서 차단되었으면 즉시 종료)
@@ -940,27 +1073,45 @@ class StockPriceSynchronizer(StockCommonMixin):
             if self.is_blocked:
                 return
         
+        stats = self._local_stats()  # 이 스레드 전용 집계
         logs = []  # 로그 버퍼
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = _now_str()
 
         def add_log(message: str, level: str = "INFO"):
             logs.append(f"[{timestamp}] [{level}] {message}")
 
+        # 자주 쓰는 상품 값은 한 번만 꺼내 둔다
+        pid = product['id']
+        model_no = product.get('model_no')
+        cur_price = product.get('price')
+        cur_lowest_price = product.get('buyma_lowest_price')
+        cur_original_price_jpy = product.get('original_price_jpy') or 0
+        cur_purchase_price_krw = float(product.get('purchase_price_krw') or 0)
+
         add_log(f"\n[{idx}/{total}] {product['brand_name']} - {product['name'][:30]} ...(상품번호: {product['model_no']})")
 
+        # 바이마 최저가 조회는 오케이몰 수집과 겹쳐 돌린다 (서로 다른 호스트라 차단과 무관).
+        #   run 이 대기열에 넣을 때 이미 띄워 둔 조회를 꺼내고, 없으면 지금 띄운다.
+        #   --gone-detect-only 는 최저가를 안 쓰므로 조회하지 않는다.
+        future_lowest = self._lowest_futures.pop(pid, None)
+        if future_lowest is None:
+            self._prefetch_lowest_price(product)
+            future_lowest = self._lowest_futures.pop(pid, None)
+
         try:
             # 1. 오케이몰 가격/재고 수집 (★ v2 세션 관리 적용)
             mall_data, error = self.collect_from_okmall(product['source_product_url'])
             if error:
                 add_log(f"  오케이몰 수집 실패: {error}", "WARNING")
+                if future_lowest is not None:
+                    future_lowest.cancel()  # 아직 시작 전이면 바이마 조회 취소
                 
                 # ★ 403 차단 또는 타임아웃 차단 감지 시 즉시 중단
                 if error == "접근 차단됨 (403)" or error == "타임아웃 차단 감지 (연속 3회)":
                     add_log(f"  → IP 차단됨! 비행기모드 토글 필요", "ERROR")
                     with self.block_lock:
                         self.is_blocked = True
-                    with stats_lock:
-                        stats['blocked'] += 1
+                    stats['blocked'] += 1
                     log_batch(logs)
                     return
 
@@ -969,8 +1120,7 @@ class StockPriceSynchronizer(StockCommonMixin):
                 #   BUYMA 에서 출품정지된다(okmall 단독 상품이면 그대로 내려감).
                 if "일시적 오류" in error:
                     add_log(f"  → 일시적 오류, 이번 회차 스킵 (재고 그대로 둠)")
-                    with stats_lock:
-                        stats['skipped'] += 1
+                    stats['skipped'] += 1
                     log_batch(logs)
                     random_delay()
                     return
@@ -982,12 +1132,11 @@ class StockPriceSynchronizer(StockCommonMixin):
                 else:
                     add_log(f"  → 수집처 삭제/종료 → okmall 재고0 표시 (BUYMA 반영은 reconcile)")
                 if not dry_run:
-                    self._mark_all_out_of_stock(product['id'])
-                    self.update_sync_time_only(product['id'])
+                    self._mark_all_out_of_stock(pid)
+                    self._queue_sync_touch(pid)
                 else:
                     add_log(f"  [DRY-RUN] okmall 재고0 표시 예정")
-                with stats_lock:
-                    stats['skipped'] += 1
+                stats['skipped'] += 1
                 log_batch(logs)  # 로그 한 번에 출력
                 random_delay()
                 return
@@ -1000,7 +1149,7 @@ class StockPriceSynchronizer(StockCommonMixin):
             # ★ --gone-detect-only: 몰 목록에서 사라진/새로 생긴 옵션 실태만 기록.
             #   DB·BUYMA 아무것도 안 바꾸고, 최저가 크롤도 안 돈다(불필요한 BUYMA 조회 방지).
             if self.gone_detect_only:
-                db_variants = self.get_current_variants(product['id'])
+                db_variants = self._pop_prefetched_variants(pid)
                 summary = {}
                 changes = self.detect_stock_changes(db_variants, mall_options,
                                                     options_complete, summary)
@@ -1017,39 +1166,40 @@ class StockPriceSynchronizer(StockCommonMixin):
                 if news:
                     add_log("      [새옵션] "
                             + ', '.join(f"{(o.get('color') or '')}/{(o.get('size') or '')}" for o in news[:8]))
-                with stats_lock:
-                    stats['detect_products'] += 1
-                    stats['detect_gone'] += len(gone)
-                    stats['detect_new'] += len(news)
-                    if not options_complete:
-                        stats['detect_incomplete'] += 1
-                    if in_stock_after == 0:
-                        stats['detect_all_gone'] += 1
-                        stats['detect_all_gone_ids'].append(product['id'])
+                stats['detect_products'] += 1
+                stats['detect_gone'] += len(gone)
+                stats['detect_new'] += len(news)
+                if not options_complete:
+                    stats['detect_incomplete'] += 1
+                if in_stock_after == 0:
+                    stats['detect_all_gone'] += 1
+                    stats.setdefault('detect_all_gone_ids', []).append(pid)
                 log_batch(logs)
                 return
 
-            # 2. 재고 변동 감지 + 바이마 최저가 수집 (★ 병렬 실행)
-            with ThreadPoolExecutor(max_workers=2) as sub_executor:
-                future_lowest = sub_executor.submit(self.get_buyma_lowest_price, product.get('model_no'))
-
-                # 최저가 수집과 동시에 재고 감지 진행
-                db_variants = self.get_current_variants(product['id'])
-                _sum = {}
-                stock_changes = self.detect_stock_changes(db_variants, mall_options,
-                                                          options_complete, _sum)
+            # 2. 재고 변동 감지 + 바이마 최저가 수집 (★ 병렬 실행 — 최저가는 맨 앞에서 이미 요청함)
+            # 최저가 수집과 동시에 재고 감지 진행
+            db_variants = self._pop_prefetched_variants(pid)
+            _sum = {}
+            stock_changes = self.detect_stock_changes(db_variants, mall_options,
+                                                      options_complete, _sum)
 
-                # 최저가 결과 대기
+            # 최저가 결과 대기
+            if future_lowest is not None:
                 competitor_lowest_price, lp_error = future_lowest.result()
+            else:
+                competitor_lowest_price, lp_error = self.get_buyma_lowest_price(model_no)
+
+            new_purchase_price_krw = new_sale_price if new_sale_price else cur_purchase_price_krw
+            shipping_fee = product.get('expected_shipping_fee') or self.get_shipping_fee(product.get('category_id'))
 
             # 4. 새 가격 계산 (JPY)
             if lp_error:
                 if "경쟁자 없음" in lp_error:
                     # 경쟁자 없음 → 매입가 기반 30% 마진 가격 재계산
-                    new_purchase = new_sale_price if new_sale_price else float(product.get('purchase_price_krw') or 0)
+                    new_purchase = new_purchase_price_krw
                     if new_purchase > 0:
-                        shipping_fee_for_calc = product.get('expected_shipping_fee') or self.get_shipping_fee(product.get('category_id'))
-                        total_cost = new_purchase + float(shipping_fee_for_calc)
+                        total_cost = new_purchase + float(shipping_fee)
                         vat_refund = new_purchase / 11.0
                         denominator = (1.0 - SALES_FEE_RATE) - 0.30  # 0.645
                         if denominator > 0:
@@ -1058,18 +1208,18 @@ class StockPriceSynchronizer(StockCommonMixin):
                             new_price_jpy = target_price_jpy
                             add_log(f"  - 경쟁자 없음 → 마진30% 가격 재계산: ¥{new_price_jpy:,}")
                         else:
-                            new_price_jpy = product.get('price')
+                            new_price_jpy = cur_price
                             add_log(f"  - 경쟁자 없음, 가격 역산 실패 → 가격 유지")
                     else:
-                        new_price_jpy = product.get('price')
+                        new_price_jpy = cur_price
                         add_log(f"  - 경쟁자 없음, 매입가 없어 가격 유지")
                     new_lowest_price = None
                 else:
                     add_log(f"  - 최저가 수집 실패: {lp_error}")
-                    new_price_jpy = product.get('price')
-                    new_lowest_price = product.get('buyma_lowest_price')
+                    new_price_jpy = cur_price
+                    new_lowest_price = cur_lowest_price
             else:
-                old_price = product.get('price') or 0
+                old_price = cur_price or 0
                 price_range_min = competitor_lowest_price - 9
                 price_range_max = competitor_lowest_price - 1
 
@@ -1078,15 +1228,13 @@ class StockPriceSynchronizer(StockCommonMixin):
                     new_price_jpy = old_price
                     new_lowest_price = competitor_lowest_price
                 else:
-                    new_price_jpy = competitor_lowest_price - random.randint(1, 9)
+                    new_price_jpy = competitor_lowest_price - _thread_rng().randint(1, 9)
                     new_lowest_price = competitor_lowest_price
                     add_log(f"  - 경쟁자 최저가: ¥{competitor_lowest_price:,} → 내 가격: ¥{new_price_jpy:,}")
 
-            new_original_price_jpy = int(new_original_price / EXCHANGE_RATE) if new_original_price else product.get('original_price_jpy') or 0
-            new_purchase_price_krw = new_sale_price if new_sale_price else float(product.get('purchase_price_krw') or 0)
+            new_original_price_jpy = int(new_original_price / EXCHANGE_RATE) if new_original_price else cur_original_price_jpy
 
             # 5. 마진 계산
-            shipping_fee = product.get('expected_shipping_fee') or self.get_shipping_fee(product.get('category_id'))
             margin_info = calculate_margin(new_price_jpy, new_purchase_price_krw, shipping_fee)
 
             add_log(f"  - 판매가: ¥{new_price_jpy:,} (₩{margin_info['sales_price_krw']:,.0f})")
@@ -1094,9 +1242,9 @@ class StockPriceSynchronizer(StockCommonMixin):
             add_log(f"  - 마진: ₩{margin_info['margin_krw']:,.0f} ({margin_info['margin_rate']:.1f}%)")
 
             # 6. 변경 여부 판단
-            old_price_jpy = product.get('price') or 0
-            old_original_price_jpy = product.get('original_price_jpy') or 0
-            old_lowest_price = product.get('buyma_lowest_price') or 0
+            old_price_jpy = cur_price or 0
+            old_original_price_jpy = cur_original_price_jpy
+            old_lowest_price = cur_lowest_price or 0
 
             need_api_call = False
             is_delete = False
@@ -1110,14 +1258,13 @@ class StockPriceSynchronizer(StockCommonMixin):
             #   목록이 완전할 때만(= 배열을 통으로 받았을 때만) 한다.
             new_added = []
             if options_complete and not dry_run:
-                new_added = self.insert_new_variants(product['id'],
+                new_added = self.insert_new_variants(pid,
                                                      _sum.get('new_options') or [], db_variants)
                 if new_added:
                     add_log(f"  - [신규옵션] {len(new_added)}개 추가: "
                             + ', '.join(f"{a['color']}/{a['size']}" for a in new_added[:8]))
-                    with stats_lock:
-                        stats['new_option_added'] = stats.get('new_option_added', 0) + len(new_added)
-                        self._new_variant_ids.extend(a['variant_id'] for a in new_added)
+                    stats['new_option_added'] += len(new_added)
+                    self._new_variant_ids.extend([a['variant_id'] for a in new_added])
                     need_api_call = True
             elif options_complete and dry_run and (_sum.get('new_options') or []):
                 add_log(f"  - [DRY-RUN] 신규옵션 {len(_sum['new_options'])}개 추가 예정")
@@ -1158,8 +1305,7 @@ class StockPriceSynchronizer(StockCommonMixin):
                     add_log(f"  [DRY-RUN] {'삭제' if is_delete else '수정'} API 호출 예정")
                 else:
                     add_log(f"  [DRY-RUN] 변경 없음, API 호출 안함")
-                with stats_lock:
-                    stats['success'] += 1
+                stats['success'] += 1
                 log_batch(logs)  # 로그 한 번에 출력
                 if need_api_call:
                     random_delay()
@@ -1172,28 +1318,32 @@ class StockPriceSynchronizer(StockCommonMixin):
                 calc_is_lowest = 1 if new_price_jpy <= new_lowest_price else 0
             calc_purchase_price_jpy = round(new_purchase_price_krw / EXCHANGE_RATE) if new_purchase_price_krw else None
 
-            self.update_ace_products_price(
-                product['id'], new_original_price, int(new_purchase_price_krw),
-                new_price_jpy, new_original_price_jpy, new_lowest_price,
-                margin_info['margin_rate'],
-                margin_amount_krw=margin_info['margin_krw'],
-                is_lowest_price=calc_is_lowest,
-                purchase_price_jpy=calc_purchase_price_jpy
-            )
+            #   가격 행은 모아 뒀다가 한 번에 쓴다 (체크 시간도 같이 찍히므로 따로 갱신하지 않음)
+            self._queue_price_update({
+                'id': pid,
+                'original_price_krw': new_original_price,
+                'purchase_price_krw': int(new_purchase_price_krw),
+                'price': new_price_jpy,
+                'original_price_jpy': new_original_price_jpy,
+                'buyma_lowest_price': new_lowest_price,
+                'margin_rate': margin_info['margin_rate'],
+                'margin_amount_krw': margin_info['margin_krw'],
+                'is_lowest_price': calc_is_lowest,
+                'purchase_price_jpy': calc_purchase_price_jpy,
+            })
+            #   가격 반영이 실패해도 _queue_price_update 는 예외를 내지 않으므로 옵션 재고 변경은 항상 쌓인다.
+            #   끝내 못 쓴 분량이 있으면 run() 이 reconcile push 를 건너뛴다.
             if stock_changes:
-                self.update_ace_variants_stock(stock_changes)
+                self._queue_variant_changes(stock_changes)
 
             # 8. [MERGE] BUYMA push 생략 — refresh 만. push(수정/삭제/옵션합침/싼몰)는 run 끝 reconcile 담당.
-            self.update_sync_time_only(product['id'])
             add_log(f"  refresh 완료 (BUYMA 반영은 reconcile)")
-            with stats_lock:
-                stats['success'] += 1
+            stats['success'] += 1
             log_batch(logs)  # 로그 한 번에 출력
 
         except Exception as e:
             add_log(f"  처리 오류: {e}", "ERROR")
-            with stats_lock:
-                stats['failed'] += 1
+            stats['failed'] += 1
             log_batch(logs)  # 로그 한 번에 출력
 
     # -------------------------------------------------
@@ -1220,6 +1370,10 @@ class StockPriceSynchronizer(StockCommonMixin):
             log("동기화할 상품이 없습니다.")
             return {'total': 0, 'success': 0, 'skipped': 0, 'failed': 0}
 
+        # 대상 상품들의 현재 옵션·카테고리 배송비를 한 번에 읽어 둔다 (상품마다 DB 왕복하지 않도록)
+        self._variants_by_product = self.get_variants_bulk([p['id'] for p in products])
+        self.prefetch_shipping_fees(p.get('category_id') for p in products)
+
         stats = {
             'total': len(products),
             'success': 0,
@@ -1238,28 +1392,67 @@ class StockPriceSynchronizer(StockCommonMixin):
             'detect_all_gone': 0,
             'detect_all_gone_ids': [],  # 차단 카운트
         }
-        stats_lock = threading.Lock()
+        self._tls = threading.local()
+        self._all_local_stats = []
 
         # 스레드 풀로 병렬 처리
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            futures = []
-
-            for idx, product in enumerate(products):
-                future = executor.submit(
-                    self.process_single_product,
-                    product, idx + 1, len(products),
-                    dry_run, force, stats, stats_lock
-                )
-                futures.append(future)
-
-            # 모든 작업 완료 대기
-            for future in as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    log(f"스레드 오류: {e}", "ERROR")
-                    with stats_lock:
-                        stats['errors'] += 1
+        #   한꺼번에 전부 submit 하지 않고 MAX_WORKERS*2 개만 띄워 둔다 (슬라이딩 윈도우).
+        #   하나 끝날 때마다 하나 채우고, 차단 감지되면 그 즉시 더 넣지 않는다.
+        #   바이마 최저가 조회는 대기열에 넣는 순간 별도 풀(lookup_executor)에 먼저 띄워,
+        #   오케이몰 수집 차례가 오기 전에 결과가 준비되도록 한다.
+        self._lowest_futures = {}
+        flush_ok = False
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor, \
+                    ThreadPoolExecutor(max_workers=BUYMA_LOOKUP_WORKERS, thread_name_prefix='buyma-lookup') as lookup_executor:
+                self._lookup_executor = lookup_executor
+                pending = iter(enumerate(products))
+                futures = set()
+
+                def submit_next() -> bool:
+                    with self.block_lock:
+                        if self.is_blocked:
+                            return False
+                    try:
+                        idx, product = next(pending)
+                    except StopIteration:
+                        return False
+                    self._prefetch_lowest_price(product)
+                    futures.add(executor.submit(
+                        self.process_single_product,
+                        product, idx + 1, len(products),
+                        dry_run, force
+                    ))
+                    return True
+
+                for _ in range(MAX_WORKERS * 2):
+                    if not submit_next():
+                        break
+
+                # 끝난 만큼 채워 넣으며 완료 대기
+                while futures:
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        try:
+                            future.result()
+                        except Exception as e:
+                            log(f"스레드 오류: {e}", "ERROR")
+                            self._local_stats()['errors'] += 1
+                        submit_next()
+
+                if self.is_blocked:
+                    log(f"차단 감지로 {sum(1 for _ in pending)}건은 시작하지 않음", "WARNING")
+                for f in self._lowest_futures.values():
+                    f.cancel()
+        finally:
+            self._lookup_executor = None
+            self._lowest_futures = {}
+            # 모아 둔 가격/체크시간/옵션 재고 갱신 반영 (reconcile 이 최신 값을 읽도록 여기서)
+            #   finally 라서 중단(Ctrl+C, 스레드 오류) 때도 처리해 둔 분량은 쓰고 끝난다.
+            flush_ok = self._flush_pending_updates()
+
+        # 스레드별 집계를 한 번에 합친다
+        self._merge_local_stats(stats)
 
         # 오케이몰 세션 정리
         if self.okmall_session:
@@ -1288,7 +1481,10 @@ class StockPriceSynchronizer(StockCommonMixin):
         if not dry_run and self._new_variant_ids:
             self._translate_and_guard(products)
 
-        if not dry_run:
+        if not dry_run and not flush_ok:
+            log(f"[MERGE] DB 반영 실패분 {self._pending_count()}건이 남아 reconcile push 생략 "
+                "(오래된 값으로 BUYMA 를 덮지 않도록)", "ERROR")
+        elif not dry_run:
             try:
                 self._reconcile_published(products)
             except Exception as e:
@@ -0,0 +1,5 @@
+"""okmall 스크립트는 폴더 안에서 실행되므로(모듈끼리 이름으로 import) 테스트도 같은 경로에서 불러온다."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,47 @@
+import pytest
+
+import stock_common
+
+
+SEARCH_PAGE = b"""
+<html><body>
+<ul>
+  <li class="product item">
+    <span class="product_used_tag">USED</span>
+    <div class="product_Buyer"><a href="/buyer/111.html">seller</a></div>
+    <span class="Price_Txt">&yen;12,000</span>
+  </li>
+  <li class="product">
+    <div class="product_Buyer"><a href="/buyer/222.html">seller</a></div>
+    <span class="Price_Txt">&yen;13,500</span>
+  </li>
+  <li class="not-a-product">
+    <span class="Price_Txt">&yen;1</span>
+  </li>
+</ul>
+</body></html>
+"""
+
+
+@pytest.fixture(params=['bs4', 'selectolax'])
+def parser(request, monkeypatch):
+    if request.param == 'bs4':
+        monkeypatch.setattr(stock_common, '_SelectolaxParser', None)
+    elif stock_common._SelectolaxParser is None:
+        pytest.skip('selectolax 미설치')
+    return request.param
+
+
+def test_multi_class_product_card_is_parsed(parser):
+    cards = list(stock_common._iter_buyma_cards(SEARCH_PAGE))
+    assert [href for _, href, _ in cards] == ['/buyer/111.html', '/buyer/222.html']
+    assert cards[0][0] is True
+    assert cards[1][0] is False
+    assert [price for _, _, price in cards] == ['¥12,000', '¥13,500']
+
+
+def test_has_product_class():
+    assert stock_common._has_product_class('product item')
+    assert stock_common._has_product_class(['item', 'product'])
+    assert not stock_common._has_product_class('products')
+    assert not stock_common._has_product_class(None)